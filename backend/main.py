@@ -11,57 +11,181 @@ import os
 # Add parent directory to path so we can import from src
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from fastapi import FastAPI, HTTPException, Header, Depends
+from fastapi import FastAPI, HTTPException, Header, Depends, Response, BackgroundTasks
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import JSONResponse, StreamingResponse
 from pydantic import BaseModel
 from typing import List, Optional
-import json
+import asyncio
+import atexit
+import hashlib
+import re
+import secrets
 import uuid
 import logging
-from datetime import datetime
-
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
+import logging.handlers
+import queue
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from contextlib import asynccontextmanager
+from functools import lru_cache
+
+import aiofiles
+import aiofiles.os
+import orjson
+try:
+    from brotli_asgi import BrotliMiddleware
+except ImportError:
+    BrotliMiddleware = None
+
+# Configure logging. Records go through a queue to a listener thread, which does
+# the stream writes instead of the event loop. QueueHandler still merges the message
+# arguments in the caller, so a mutable argument is logged as it was at the call.
+_log_queue = queue.SimpleQueue()
+_log_stream = logging.StreamHandler()
+_log_stream.setFormatter(logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
+log_listener = logging.handlers.QueueListener(_log_queue, _log_stream)
+log_listener.start()
+atexit.register(log_listener.stop)
+
+_log_queue_handler = logging.handlers.QueueHandler(_log_queue)
+# Message only; the listener's formatter adds the timestamp, logger and level
+_log_queue_handler.setFormatter(logging.Formatter('%(message)s'))
+logging.basicConfig(level=logging.INFO, handlers=[_log_queue_handler])
 logger = logging.getLogger("learning-coach-api")
+# Per-request chatter from the hottest read endpoints; set LOG_HOT_LEVEL=INFO to see it
+hot_logger = logging.getLogger("learning-coach-api.hot")
+hot_logger.setLevel(os.getenv("LOG_HOT_LEVEL", "WARNING"))
 
 from src.memory import MemoryManager
 from src.agents.goal_agent import GoalAgent
 from src.agents.diagnostic_agent import DiagnosticAgent
 from src.agents.optimizer_agent import OptimizerAgent
 from src.agents.examiner_agent import ExaminerAgent
+from src.agents.genai_client import shared_client
 from src.models import LearningGoal, UserProfile, Flashcard, Question, AssessmentResult, Milestone
 
-from src.utils import to_snake_case
+from src.utils import to_snake_case, truncate_title
+
+class ORJSONResponse(JSONResponse):
+    """JSON response rendered with orjson instead of the stdlib encoder."""
+
+    def render(self, content) -> bytes:
+        return orjson.dumps(content)
+
+
+async def warm_up_llm():
+    """
+    Builds the agents and opens the Gemini connection pool with one cheap list call,
+    so the first user request doesn't pay the TLS/DNS handshake. Best effort only.
+    """
+    try:
+        for factory in (get_goal_agent, get_diagnostic_agent, get_optimizer_agent, get_examiner_agent):
+            factory()
+        await asyncio.wait_for(get_genai_client().aio.models.list(config={"page_size": 1}), timeout=10)
+        logger.info("Gemini client warmed up")
+    except Exception as e:
+        logger.warning("Gemini warmup failed (continuing cold): %s", e)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    global grading_pool
+    grading_pool = ThreadPoolExecutor(max_workers=GRADING_WORKERS, thread_name_prefix="grader")
+    # Warm up in the background so the worker starts accepting requests immediately
+    warmup = asyncio.create_task(warm_up_llm()) if os.getenv("LLM_WARMUP", "1") == "1" else None
+    yield
+    if warmup:
+        warmup.cancel()
+    grading_pool.shutdown(wait=False)
+
 
 app = FastAPI(
     title="AI Learning Coach API",
     description="Backend API for the iOS Learning Coach app",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan,
 )
 
 # CORS for iOS app
+# Explicit browser origins (comma-separated CORS_ORIGINS); the native iOS client doesn't send Origin
+CORS_ORIGINS = [
+    origin.strip()
+    for origin in os.getenv("CORS_ORIGINS", "capacitor://localhost,http://localhost,http://localhost:8000").split(",")
+    if origin.strip()
+]
+
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],  # Allow all origins for local development
+    allow_origins=CORS_ORIGINS,
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag", "X-Quiz-ID"],
 )
+# Flashcard and exam payloads compress well; skip tiny responses where compression costs more than it saves.
+# Brotli (when brotli-asgi is installed) beats gzip on repetitive JSON and still serves gzip to older clients.
+if BrotliMiddleware is not None:
+    app.add_middleware(BrotliMiddleware, minimum_size=1024, quality=4, gzip_fallback=True)
+else:
+    app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
+
+# Agent singletons, built lazily so each worker process creates its own.
+# All agents share one Gemini client, and with it one keep-alive connection pool.
+def get_genai_client():
+    return shared_client()
+
+
+@lru_cache(maxsize=None)
+def get_goal_agent() -> GoalAgent:
+    return GoalAgent(client=get_genai_client())
+
+
+@lru_cache(maxsize=None)
+def get_diagnostic_agent() -> DiagnosticAgent:
+    return DiagnosticAgent(client=get_genai_client())
+
+
+@lru_cache(maxsize=None)
+def get_optimizer_agent() -> OptimizerAgent:
+    return OptimizerAgent(client=get_genai_client())
+
+
+@lru_cache(maxsize=None)
+def get_examiner_agent() -> ExaminerAgent:
+    return ExaminerAgent(client=get_genai_client())
+
+
+# Dedicated executor for grading so evaluate_submission never runs on the event loop.
+# Grading is a network-bound LLM call (and the agent's client can't be pickled), so threads suffice.
+GRADING_WORKERS = int(os.getenv("GRADING_WORKERS", min(32, (os.cpu_count() or 1) + 4)))
+grading_pool: Optional[ThreadPoolExecutor] = None
 
-# Initialize agents (singleton pattern)
-goal_agent = GoalAgent()
-diagnostic_agent = DiagnosticAgent()
-optimizer_agent = OptimizerAgent()
-examiner_agent = ExaminerAgent()
 
 BASE_CACHE_PATH = ".coin_cache"
 
+# Questions served to clients, keyed by (user_id, project_id, milestone title or
+# "diagnostic"), so grading reuses the exact set that was handed out.
+QUESTIONS_CACHE_SIZE = 10_000
+questions_cache: "OrderedDict[tuple, List[Question]]" = OrderedDict()
+# Pending quiz id issued for each questions_cache key, reused across repeat GETs
+issued_quiz_ids: dict = {}
+# In-flight background flashcard generations, keyed by (user_id, project_id, milestone title)
+flashcard_prefetches: "dict[tuple, asyncio.Task]" = {}
+
 
 # ============== Dependency Injection ==============
 
+_USER_ID_RE = re.compile(r"[^A-Za-z0-9_-]+")
+# Header bytes considered before sanitizing; bounds work on pathological inputs
+MAX_USER_ID_HEADER = 128
+# Longest id used as a directory name
+MAX_USER_ID_LENGTH = 64
+
+
 async def get_user_id(x_user_id: Optional[str] = Header(None)) -> str:
     """
     Extracts the User ID from the X-User-ID header.
@@ -69,9 +193,13 @@ async def get_user_id(x_user_id: Optional[str] = Header(None)) -> str:
     """
     if not x_user_id:
         return "default_user"
-    
-    # Sanitize user_id to be safe for filesystem
-    safe_id = "".join([c for c in x_user_id if c.isalnum() or c in "-_"])
+    return sanitize_user_id(x_user_id[:MAX_USER_ID_HEADER])
+
+
+@lru_cache(maxsize=4096)
+def sanitize_user_id(x_user_id: str) -> str:
+    """Strips everything but [A-Za-z0-9_-] so the id is safe for the filesystem."""
+    safe_id = _USER_ID_RE.sub("", x_user_id)[:MAX_USER_ID_LENGTH]
     return safe_id or "default_user"
 
 
@@ -92,6 +220,10 @@ class ProjectResponse(BaseModel):
     completed_milestones: List[str]
 
 
+class ProjectDetailResponse(ProjectResponse):
+    milestones: List[Milestone]
+
+
 class FlashcardResponse(BaseModel):
     id: int
     front: str
@@ -117,6 +249,7 @@ class QuestionResponse(BaseModel):
 
 class SubmitAnswersRequest(BaseModel):
     answers: List[str]
+    quiz_id: Optional[str] = None  # X-Quiz-ID returned with the questions
 
 
 class QuestionResultResponse(BaseModel):
@@ -147,143 +280,308 @@ class SyncProgressRequest(BaseModel):
 
 # ============== Helper Functions ==============
 
+# User directories already created by this process; skips the makedirs syscalls on repeat requests
+_known_user_dirs: set = set()
+
+
+@lru_cache(maxsize=4096)
 def get_user_cache_path(user_id: str) -> str:
     """Returns the cache directory for a specific user."""
     path = os.path.join(BASE_CACHE_PATH, user_id)
-    os.makedirs(path, exist_ok=True)
+    if user_id not in _known_user_dirs:
+        os.makedirs(path, exist_ok=True)
+        _known_user_dirs.add(user_id)
     return path
 
-def list_projects(user_id: str) -> List[tuple]:
+
+@lru_cache(maxsize=16384)
+def _project_path(user_id: str, project_id: str) -> str:
+    """Returns the storage directory for a user's project."""
+    return os.path.join(get_user_cache_path(user_id), project_id)
+
+
+# Max project directories read concurrently by GET /projects
+PROJECT_LOAD_CONCURRENCY = 32
+
+# Listing caches, invalidated by mtime: the user directory's mtime changes when a
+# project directory is added, and each goal file's mtime changes when it is saved.
+_project_dirs_cache: dict = {}  # user_path -> (mtime_ns, [project dir names])
+_project_title_cache: dict = {}  # goal_path -> (mtime_ns, title)
+# (user_id, project_id) pairs known to have a learning goal on disk
+_known_projects: set = set()
+
+
+async def list_projects(user_id: str) -> List[tuple]:
     """Lists available project directories for a user."""
     user_path = get_user_cache_path(user_id)
     
-    if not os.path.exists(user_path):
+    try:
+        user_mtime = (await aiofiles.os.stat(user_path)).st_mtime_ns
+    except FileNotFoundError:
         return []
     
-    projects = []
-    seen_ids = set()
+    cached_dirs = _project_dirs_cache.get(user_path)
+    if cached_dirs and cached_dirs[0] == user_mtime:
+        project_dirs = cached_dirs[1]
+    else:
+        project_dirs = [entry.name for entry in await aiofiles.os.scandir(user_path) if entry.is_dir()]
+        _project_dirs_cache[user_path] = (user_mtime, project_dirs)
     
-    for item in os.listdir(user_path):
-        if item in seen_ids:
+    projects = []
+    for item in project_dirs:
+        goal_path = f"{_project_path(user_id, item)}/learning_goal.json"
+        try:
+            goal_mtime = (await aiofiles.os.stat(goal_path)).st_mtime_ns
+        except FileNotFoundError:
             continue
-            
-        item_path = os.path.join(user_path, item)
-        if os.path.isdir(item_path) and os.path.exists(os.path.join(item_path, "learning_goal.json")):
-            try:
-                with open(os.path.join(item_path, "learning_goal.json"), 'r') as f:
-                    data = json.load(f)
-                    title = data.get("smart_goal", item)
-                    projects.append((item, title))
-                    seen_ids.add(item)
-            except Exception:
-                 projects.append((item, item))
-                 seen_ids.add(item)
+        _known_projects.add((user_id, item))
+        
+        cached_title = _project_title_cache.get(goal_path)
+        if cached_title and cached_title[0] == goal_mtime:
+            projects.append((item, cached_title[1]))
+            continue
+        
+        try:
+            async with aiofiles.open(goal_path, 'rb') as f:
+                data = orjson.loads(await f.read())
+                title = data.get("smart_goal", item)
+        except Exception:
+            title = item
+        _project_title_cache[goal_path] = (goal_mtime, title)
+        projects.append((item, title))
+    
     return projects
 
 
-def get_memory_manager(project_id: str, user_id: str) -> MemoryManager:
-    """Get memory manager for a specific project and user."""
-    user_path = get_user_cache_path(user_id)
-    project_path = os.path.join(user_path, project_id)
+def cache_questions(key: tuple, questions: List[Question]):
+    """Stores served questions in the bounded in-process cache (LRU eviction)."""
+    questions_cache[key] = questions
+    questions_cache.move_to_end(key)
+    if len(questions_cache) > QUESTIONS_CACHE_SIZE:
+        evicted, _ = questions_cache.popitem(last=False)
+        issued_quiz_ids.pop(evicted, None)
+
+
+def issue_quiz(memory: MemoryManager, key: tuple, questions: List[Question]) -> str:
+    """Persists the questions being handed out and returns the quiz id to submit against."""
+    quiz_id = issued_quiz_ids.get(key)
+    if quiz_id and questions_cache.get(key) is questions and os.path.exists(f"{memory.pending_quiz_dir}/{quiz_id}.json"):
+        return quiz_id
+    quiz_id = uuid.uuid4().hex
+    memory.save_pending_quiz(quiz_id, questions)
+    issued_quiz_ids[key] = quiz_id
+    return quiz_id
+
+
+async def prefetch_flashcards(user_id: str, project_id: str, memory: MemoryManager, goal: LearningGoal, profile: UserProfile):
+    """
+    Generates and caches the current milestone's flashcards ahead of the client asking for them.
+    Runs as a background task; get_flashcards awaits it instead of starting a second generation.
+    """
+    milestone = get_current_milestone(goal, profile)
+    if not milestone or memory.load_milestone_flashcards(milestone.title):
+        return
+    key = (user_id, project_id, milestone.title)
+    if key in flashcard_prefetches:
+        return
+    
+    task = asyncio.ensure_future(get_optimizer_agent().agenerate_curriculum_and_cards(goal, profile))
+    flashcard_prefetches[key] = task
+    try:
+        _, cards = await task
+        await asyncio.to_thread(memory.save_milestone_flashcards, milestone.title, cards)
+        logger.info("Prefetched %s flashcards for '%s'", len(cards), milestone.title)
+    except Exception as e:
+        logger.warning("Flashcard prefetch failed for %s: %s", project_id, e)
+    finally:
+        flashcard_prefetches.pop(key, None)
+
+
+def parse_quiz_id(quiz_id: Optional[str]) -> Optional[str]:
+    """Normalizes a client-supplied quiz id; anything that isn't a UUID yields None."""
+    if not quiz_id:
+        return None
+    try:
+        return uuid.UUID(hex=quiz_id).hex
+    except ValueError:
+        return None
+
+
+def _now_iso() -> str:
+    """Timezone-aware UTC timestamp for assessment results."""
+    return datetime.now(timezone.utc).isoformat()
+
+
+def get_current_milestone(goal: LearningGoal, profile: UserProfile) -> Optional[Milestone]:
+    """The milestone the learner is on, via the index submit_exam advances; None once all are done."""
+    if profile.current_milestone_index >= len(goal.milestones):
+        return None
+    return goal.milestones[profile.current_milestone_index]
+
+
+def milestone_title(milestone: Optional[Milestone]) -> Optional[str]:
+    return milestone.title if milestone else None
+
+
+def compute_etag(*paths: str) -> str:
+    """Weak ETag derived from the mtime and size of the files a response is built from."""
+    digest = hashlib.blake2b(digest_size=8)
+    for path in paths:
+        try:
+            st = os.stat(path)
+            digest.update(f"{path}:{st.st_mtime_ns}:{st.st_size};".encode())
+        except FileNotFoundError:
+            digest.update(f"{path}:-;".encode())
+    return f'W/"{digest.hexdigest()}"'
+
+
+def etag_matches(etag: str, if_none_match: Optional[str]) -> bool:
+    """True if the client's If-None-Match header already names this ETag."""
+    if not if_none_match:
+        return False
+    return if_none_match.strip() == "*" or etag in (tag.strip() for tag in if_none_match.split(","))
+
+
+def get_memory_manager(project_id: str, user_id: str, create: bool = False) -> MemoryManager:
+    """
+    Get memory manager for a specific project and user.
+    Raises 404 for unknown projects unless create=True (only create_project writes new ones).
+    """
+    project_path = _project_path(user_id, project_id)
     
-    # We allow creating the manager even if dir doesn't exist yet (MemoryManager handles it)
-    # but strictly checking existence for 'get' operations is good practice.
-    # Here we let MemoryManager handle the specific project subdirectory creation.
+    key = (user_id, project_id)
+    if not create and key not in _known_projects:
+        if not os.path.exists(f"{project_path}/learning_goal.json"):
+            raise HTTPException(status_code=404, detail=f"Project {project_id} not found")
+        _known_projects.add(key)
     
     return MemoryManager(storage_dir=project_path)
 
 
+async def get_memory_manager_dep(project_id: str, user_id: str = Depends(get_user_id)) -> MemoryManager:
+    """Async dependency wrapper so FastAPI resolves the manager inline rather than via the threadpool."""
+    return get_memory_manager(project_id, user_id)
+
+
 # ============== Project Endpoints ==============
 
 @app.get("/")
 async def root():
     """Health check endpoint."""
-    logger.info("Health check requested")
+    hot_logger.info("Health check requested")
     return {"status": "ok", "message": "AI Learning Coach API is running"}
 
 
-@app.get("/projects", response_model=List[ProjectResponse])
-async def get_projects(user_id: str = Depends(get_user_id)):
+def _load_meta(memory: MemoryManager) -> tuple:
+    return memory.load_learning_goal(), memory.load_user_profile()
+
+
+@app.get("/projects", response_model=None, responses={200: {"model": List[ProjectResponse]}})
+async def get_projects(user_id: str = Depends(get_user_id), if_none_match: Optional[str] = Header(None)):
     """List all learning projects for the authenticated user."""
-    logger.info(f"Listing projects for user: {user_id}")
-    projects = list_projects(user_id)
-    result = []
-    
-    for project_id, title in projects:
-        memory = get_memory_manager(project_id, user_id)
-        goal = memory.load_learning_goal()
-        profile = memory.load_user_profile()
+    logger.info("Listing projects for user: %s", user_id)
+    projects = await list_projects(user_id)
+    
+    # Repeat polls with an unchanged project set get a bodiless 304
+    memories = [get_memory_manager(project_id, user_id) for project_id, _ in projects]
+    # 2 x N stats: run them off the event loop, as list_projects does its own
+    etag = await asyncio.to_thread(
+        compute_etag, *(path for memory in memories for path in (memory.goal_file, memory.user_file))
+    )
+    if etag_matches(etag, if_none_match):
+        return Response(status_code=304, headers={"ETag": etag})
+    
+    # Bound concurrent file reads so a user with many projects can't exhaust file descriptors
+    semaphore = asyncio.Semaphore(PROJECT_LOAD_CONCURRENCY)
+
+    async def _build(project_id: str, title: str, memory: MemoryManager) -> dict:
+        async with semaphore:
+            # One thread hop per project: both loads are a stat plus a cache hit once warm
+            goal, profile = await asyncio.to_thread(_load_meta, memory)
         
         # Use filename as title if goal not loaded yet
-        display_title = goal.smart_goal if goal else title
+        display_title = goal.display_title if goal else truncate_title(title)
         
-        result.append(ProjectResponse(
-            id=project_id,
-            title=display_title[:60] + "..." if len(display_title) > 60 else display_title,
-            smart_goal=goal.smart_goal if goal else "",
-            total_duration_days=goal.total_duration_days if goal else 0,
-            current_milestone_index=profile.current_milestone_index,
-            current_milestone_title=next((m.title for m in goal.milestones if m.title not in profile.completed_milestones), None) if goal else None,
-            completed_milestones=profile.completed_milestones
-        ))
+        # Plain dict in the ProjectResponse shape; the data is ours, so skip response validation
+        return {
+            "id": project_id,
+            "title": display_title,
+            "smart_goal": goal.smart_goal if goal else "",
+            "total_duration_days": goal.total_duration_days if goal else 0,
+            "current_milestone_index": profile.current_milestone_index,
+            "current_milestone_title": milestone_title(get_current_milestone(goal, profile)) if goal else None,
+            "completed_milestones": profile.completed_milestones,
+        }
     
-    return result
+    payload = await asyncio.gather(*(
+        _build(project_id, title, memory) for (project_id, title), memory in zip(projects, memories)
+    ))
+    return ORJSONResponse(content=payload, headers={"ETag": etag})
 
 
 @app.post("/projects", response_model=ProjectResponse)
 async def create_project(request: CreateProjectRequest, user_id: str = Depends(get_user_id)):
-    """Create a new learning project with a short UUID-based ID."""
-    # Generate a short unique ID (8 chars)
-    project_id = str(uuid.uuid4())[:8]
-    logger.info(f"Creating project '{request.topic}' for user {user_id} with ID {project_id}")
+    """
+    Create a new learning project with a short random ID.
     
-    memory = get_memory_manager(project_id, user_id)
+    IDs are 8 hex chars from secrets.token_hex(4): 32 bits is plenty within one
+    user's directory, and any collision with an existing project is simply redrawn.
+    """
+    user_path = get_user_cache_path(user_id)
+    project_id = secrets.token_hex(4)
+    while os.path.exists(os.path.join(user_path, project_id)):
+        project_id = secrets.token_hex(4)
+    logger.info("Creating project '%s' for user %s with ID %s", request.topic, user_id, project_id)
     
-    # Create learning plan
-    learning_goal = goal_agent.create_learning_plan(request.topic, existing_plan=request.existing_plan)
-    memory.save_learning_goal(learning_goal)
+    memory = get_memory_manager(project_id, user_id, create=True)
+    
+    # Plan, first-milestone flashcards and diagnostic quiz come back from one LLM call
+    bootstrap = await get_goal_agent().abootstrap_project(request.topic, existing_plan=request.existing_plan)
+    learning_goal = bootstrap.learning_goal
+    diagnostic_questions = bootstrap.diagnostic_questions.questions
+    
+    saves = [
+        asyncio.to_thread(memory.save_learning_goal, learning_goal),
+        asyncio.to_thread(memory.save_diagnostic_quiz, diagnostic_questions),
+    ]
+    if learning_goal.milestones and bootstrap.initial_flashcards.flashcards:
+        saves.append(asyncio.to_thread(
+            memory.save_milestone_flashcards, learning_goal.milestones[0].title, bootstrap.initial_flashcards.flashcards
+        ))
+    await asyncio.gather(*saves)
+    cache_questions((user_id, project_id, "diagnostic"), diagnostic_questions)
+    _known_projects.add((user_id, project_id))
     
     profile = memory.load_user_profile()
     
-    return ProjectResponse(
+    return ProjectResponse.model_construct(
         id=project_id,
-        title=learning_goal.smart_goal[:60] + "..." if len(learning_goal.smart_goal) > 60 else learning_goal.smart_goal,
+        title=learning_goal.display_title,
         smart_goal=learning_goal.smart_goal,
         total_duration_days=learning_goal.total_duration_days,
         current_milestone_index=profile.current_milestone_index,
-        current_milestone_title=next((m.title for m in learning_goal.milestones if m.title not in profile.completed_milestones), None),
+        current_milestone_title=milestone_title(get_current_milestone(learning_goal, profile)),
         completed_milestones=profile.completed_milestones
     )
 
 
 class UpdatePlanRequest(BaseModel):
-    milestones: List[dict]
+    milestones: List[Milestone]
 
 
 @app.put("/projects/{project_id}/plan", response_model=ProjectResponse)
-async def update_project_plan(project_id: str, request: UpdatePlanRequest, user_id: str = Depends(get_user_id)):
+async def update_project_plan(project_id: str, request: UpdatePlanRequest, user_id: str = Depends(get_user_id), memory: MemoryManager = Depends(get_memory_manager_dep)):
     """Update the milestones for a project."""
-    logger.info(f"Updating plan for project {project_id} (user {user_id})")
-    memory = get_memory_manager(project_id, user_id)
+    logger.info("Updating plan for project %s (user %s)", project_id, user_id)
     goal = memory.load_learning_goal()
     profile = memory.load_user_profile()
     
     if not goal:
         raise HTTPException(status_code=404, detail="No learning goal found")
     
-    # Reconstruct Milestone objects from dicts
-    try:
-        new_milestones = [
-            Milestone(
-                title=m['title'],
-                description=m['description'],
-                concepts=m['concepts'],
-                duration_days=m.get('duration_days', 3)
-            ) for m in request.milestones
-        ]
-    except KeyError as e:
-        raise HTTPException(status_code=400, detail=f"Missing field in milestone: {e}")
-        
+    # Milestones were validated (and duration_days defaulted) when the request was parsed
+    new_milestones = request.milestones
+    
     # Validation: Don't allow changing past milestones if they are already completed?
     # For now, we trust the UI to handle presentation, but we should ensure the count is consistent.
     
@@ -292,94 +590,158 @@ async def update_project_plan(project_id: str, request: UpdatePlanRequest, user_
     
     memory.save_learning_goal(goal)
     
-    return ProjectResponse(
+    return ProjectResponse.model_construct(
         id=project_id,
-        title=goal.smart_goal[:60] + "..." if len(goal.smart_goal) > 60 else goal.smart_goal,
+        title=goal.display_title,
         smart_goal=goal.smart_goal,
         total_duration_days=goal.total_duration_days,
         current_milestone_index=profile.current_milestone_index,
-        current_milestone_title=next((m.title for m in goal.milestones if m.title not in profile.completed_milestones), None),
+        current_milestone_title=milestone_title(get_current_milestone(goal, profile)),
         completed_milestones=profile.completed_milestones
     )
 
 
-@app.get("/projects/{project_id}")
-async def get_project(project_id: str, user_id: str = Depends(get_user_id)):
+@app.get("/projects/{project_id}", response_model=ProjectDetailResponse, response_model_exclude_none=True)
+async def get_project(project_id: str, response: Response, user_id: str = Depends(get_user_id), memory: MemoryManager = Depends(get_memory_manager_dep), if_none_match: Optional[str] = Header(None)):
     """Get detailed project information including full milestone details."""
-    logger.info(f"Getting project {project_id} for user {user_id}")
-    memory = get_memory_manager(project_id, user_id)
+    logger.info("Getting project %s for user %s", project_id, user_id)
+    
+    etag = compute_etag(memory.goal_file, memory.user_file)
+    if etag_matches(etag, if_none_match):
+        return Response(status_code=304, headers={"ETag": etag})
+    response.headers["ETag"] = etag
     goal = memory.load_learning_goal()
     profile = memory.load_user_profile()
     
     if not goal:
-        logger.warning(f"Project {project_id} not found for user {user_id}")
+        logger.warning("Project %s not found for user %s", project_id, user_id)
         raise HTTPException(status_code=404, detail=f"Project {project_id} not found")
     
+    return ProjectDetailResponse.model_construct(
+        id=project_id,
+        title=goal.display_title,
+        smart_goal=goal.smart_goal,
+        total_duration_days=goal.total_duration_days,
+        current_milestone_index=profile.current_milestone_index,
+        current_milestone_title=milestone_title(get_current_milestone(goal, profile)),
+        completed_milestones=profile.completed_milestones,
+        milestones=goal.milestones
+    )
+
+
+# ============== Flashcard Endpoints ==============
+
+def flashcard_item(i: int, card: Flashcard) -> dict:
+    """Serializes one card in the FlashcardResponse shape, skipping response-model validation."""
     return {
-        "id": project_id,
-        "title": goal.smart_goal[:60] + "..." if len(goal.smart_goal) > 60 else goal.smart_goal,
-        "smart_goal": goal.smart_goal,
-        "total_duration_days": goal.total_duration_days,
-        "current_milestone_index": profile.current_milestone_index,
-        "completed_milestones": profile.completed_milestones,
-        "milestones": [{
-            "title": m.title,
-            "description": m.description,
-            "concepts": m.concepts,
-            "duration_days": m.duration_days
-        } for m in goal.milestones]
+        "id": i,
+        "front": card.front,
+        "back": card.back,
+        "tags": card.tags,
+        "ease_factor": 2.5,
+        "interval": 1,
+        "repetitions": 0,
+        "next_review_date": None,
     }
 
 
-# ============== Flashcard Endpoints ==============
+def flashcard_payload(cards) -> List[dict]:
+    return [flashcard_item(i, card) for i, card in enumerate(cards)]
+
+
+def sse_event(event: str, data) -> bytes:
+    """Encodes one server-sent event with an orjson payload."""
+    return b"event: " + event.encode() + b"\ndata: " + orjson.dumps(data) + b"\n\n"
+
 
-@app.get("/projects/{project_id}/flashcards", response_model=List[FlashcardResponse])
-async def get_flashcards(project_id: str, user_id: str = Depends(get_user_id)):
+def sse_response(events) -> StreamingResponse:
+    return StreamingResponse(events, media_type="text/event-stream", headers={"Cache-Control": "no-cache"})
+
+
+
+@app.get("/projects/{project_id}/flashcards", response_model=None, responses={200: {"model": List[FlashcardResponse]}})
+async def get_flashcards(project_id: str, user_id: str = Depends(get_user_id), memory: MemoryManager = Depends(get_memory_manager_dep)):
     """Get flashcards for the current milestone (cached)."""
-    logger.info(f"Fetching flashcards for project {project_id} (user {user_id})")
-    memory = get_memory_manager(project_id, user_id)
+    hot_logger.info("Fetching flashcards for project %s (user %s)", project_id, user_id)
     goal = memory.load_learning_goal()
     profile = memory.load_user_profile()
     
     if not goal:
         raise HTTPException(status_code=404, detail="No learning goal found")
     
-    # Find current milestone
-    current_milestone = None
-    for m in goal.milestones:
-        if m.title not in profile.completed_milestones:
-            current_milestone = m
-            break
+    current_milestone = get_current_milestone(goal, profile)
     
     if not current_milestone:
-        logger.info("All milestones completed")
+        hot_logger.info("All milestones completed")
         return []
     
     # Check cache first
     cached_cards = memory.load_milestone_flashcards(current_milestone.title)
     if cached_cards:
-        logger.info(f"Loaded {len(cached_cards)} flashcards from cache for '{current_milestone.title}'")
+        hot_logger.info("Loaded %s flashcards from cache for '%s'", len(cached_cards), current_milestone.title)
         generated_cards = cached_cards
     else:
-        # Generate and cache
-        logger.info(f"Generating new flashcards for '{current_milestone.title}'")
-        deck_path, generated_cards = optimizer_agent.generate_curriculum_and_cards(goal, profile)
-        memory.save_milestone_flashcards(current_milestone.title, generated_cards)
-        logger.info(f"Cached {len(generated_cards)} flashcards")
+        generated_cards = None
+        prefetch = flashcard_prefetches.get((user_id, project_id, current_milestone.title))
+        if prefetch:
+            # A background prefetch is already generating this deck; share its result
+            try:
+                _, generated_cards = await asyncio.shield(prefetch)
+            except Exception:
+                generated_cards = None
+        if not generated_cards:
+            # Generate and cache
+            logger.info("Generating new flashcards for '%s'", current_milestone.title)
+            deck_path, generated_cards = await get_optimizer_agent().agenerate_curriculum_and_cards(goal, profile)
+            memory.save_milestone_flashcards(current_milestone.title, generated_cards)
+            logger.info("Cached %s flashcards", len(generated_cards))
     
     # Return cards
-    return [
-        FlashcardResponse(
-            id=i,
-            front=card.front,
-            back=card.back,
-            tags=card.tags,
-            ease_factor=2.5,
-            interval=1,
-            repetitions=0
-        )
-        for i, card in enumerate(generated_cards)
-    ]
+    return ORJSONResponse(content=flashcard_payload(generated_cards))
+
+
+@app.get("/projects/{project_id}/flashcards/stream")
+async def stream_flashcards(project_id: str, user_id: str = Depends(get_user_id), memory: MemoryManager = Depends(get_memory_manager_dep)):
+    """
+    Server-sent events variant of get_flashcards: one `card` event per flashcard as it is
+    generated, then a `done` event. Cached decks are replayed immediately.
+    """
+    logger.info("Streaming flashcards for project %s (user %s)", project_id, user_id)
+    goal = memory.load_learning_goal()
+    profile = memory.load_user_profile()
+    
+    if not goal:
+        raise HTTPException(status_code=404, detail="No learning goal found")
+    
+    current_milestone = get_current_milestone(goal, profile)
+    
+    async def events():
+        if not current_milestone:
+            yield sse_event("done", {"count": 0})
+            return
+        
+        cached_cards = memory.load_milestone_flashcards(current_milestone.title)
+        if cached_cards:
+            for i, card in enumerate(cached_cards):
+                yield sse_event("card", flashcard_item(i, card))
+            yield sse_event("done", {"count": len(cached_cards)})
+            return
+        
+        cards = []
+        try:
+            async for card in get_optimizer_agent().astream_curriculum_cards(goal, profile):
+                yield sse_event("card", flashcard_item(len(cards), card))
+                cards.append(card)
+        except Exception as e:
+            logger.error("Flashcard stream failed for %s: %s", project_id, e)
+            yield sse_event("error", {"detail": "Flashcard generation failed"})
+            return
+        
+        await asyncio.to_thread(memory.save_milestone_flashcards, current_milestone.title, cards)
+        logger.info("Cached %s streamed flashcards", len(cards))
+        yield sse_event("done", {"count": len(cards)})
+    
+    return sse_response(events())
 
 
 @app.post("/projects/{project_id}/flashcards/review")
@@ -408,11 +770,10 @@ async def sync_flashcard_progress(project_id: str, sync_request: SyncProgressReq
     }
 
 
-@app.get("/projects/{project_id}/flashcards/remediation", response_model=List[FlashcardResponse])
-async def get_remediation_flashcards(project_id: str, user_id: str = Depends(get_user_id)):
+@app.get("/projects/{project_id}/flashcards/remediation", response_model=None, responses={200: {"model": List[FlashcardResponse]}})
+async def get_remediation_flashcards(project_id: str, user_id: str = Depends(get_user_id), memory: MemoryManager = Depends(get_memory_manager_dep)):
     """Get remediation flashcards if user failed last exam."""
-    logger.info(f"Fetching remediation flashcards for project {project_id} (user {user_id})")
-    memory = get_memory_manager(project_id, user_id)
+    logger.info("Fetching remediation flashcards for project %s (user %s)", project_id, user_id)
     goal = memory.load_learning_goal()
     profile = memory.load_user_profile()
     
@@ -420,7 +781,7 @@ async def get_remediation_flashcards(project_id: str, user_id: str = Depends(get
         raise HTTPException(status_code=404, detail="No learning goal found")
     
     # Check if user failed last exam
-    if not profile.assessment_history:
+    if not profile.assessment_history or not get_current_milestone(goal, profile):
         return []
     
     last_result = profile.assessment_history[-1]
@@ -431,216 +792,257 @@ async def get_remediation_flashcards(project_id: str, user_id: str = Depends(get
     # Check cache first
     cached_cards = memory.load_remediation_flashcards()
     if cached_cards:
-        logger.info(f"Loaded {len(cached_cards)} remediation flashcards from cache")
+        logger.info("Loaded %s remediation flashcards from cache", len(cached_cards))
         generated_cards = cached_cards
     else:
         # Generate remediation cards
         logger.info("Generating new remediation flashcards")
-        deck_path, generated_cards = optimizer_agent.generate_remediation_cards(goal, profile, last_result)
+        deck_path, generated_cards = await get_optimizer_agent().agenerate_remediation_cards(goal, profile, last_result)
         memory.save_remediation_flashcards(generated_cards)
-        logger.info(f"Cached {len(generated_cards)} remediation flashcards")
+        logger.info("Cached %s remediation flashcards", len(generated_cards))
     
     # Return cards
-    return [
-        FlashcardResponse(
-            id=i,
-            front=card.front,
-            back=card.back,
-            tags=card.tags,
-            ease_factor=2.5,
-            interval=1,
-            repetitions=0
-        )
-        for i, card in enumerate(generated_cards)
-    ]
+    return ORJSONResponse(content=flashcard_payload(generated_cards))
 
 
 # ============== Diagnostic Endpoints ==============
 
-@app.get("/projects/{project_id}/diagnostic", response_model=List[QuestionResponse])
-async def get_diagnostic_quiz(project_id: str, user_id: str = Depends(get_user_id)):
+def question_item(i: int, q: Question) -> dict:
+    """Serializes one question in the QuestionResponse shape, without answer or explanation."""
+    return {"id": i, "text": q.text, "difficulty": q.difficulty, "key_concept": q.key_concept}
+
+
+def question_payload(questions: List[Question]) -> List[dict]:
+    return [question_item(i, q) for i, q in enumerate(questions)]
+
+
+def assessment_payload(result: AssessmentResult, passed: bool) -> dict:
+    """Serializes a graded result in the AssessmentResultResponse shape, skipping response-model validation."""
+    payload = result.model_dump(mode="python", exclude={"timestamp"})
+    payload["passed"] = passed
+    return payload
+
+
+
+@app.get("/projects/{project_id}/diagnostic", response_model=None, responses={200: {"model": List[QuestionResponse]}})
+async def get_diagnostic_quiz(project_id: str, user_id: str = Depends(get_user_id), memory: MemoryManager = Depends(get_memory_manager_dep)):
     """Generate or retrieve a diagnostic quiz for the project."""
-    logger.info(f"Generating/Retrieving diagnostic quiz for project {project_id}")
-    memory = get_memory_manager(project_id, user_id)
+    hot_logger.info("Generating/Retrieving diagnostic quiz for project %s", project_id)
     goal = memory.load_learning_goal()
     
     if not goal:
-        logger.error(f"Goal not found for project {project_id} (user {user_id})")
+        logger.error("Goal not found for project %s (user %s)", project_id, user_id)
         raise HTTPException(status_code=404, detail=f"Project {project_id} not found")
     
-    # Check if quiz already exists
-    questions = memory.load_diagnostic_quiz()
+    # Check if quiz already exists (in memory, then on disk)
+    cache_key = (user_id, project_id, "diagnostic")
+    questions = questions_cache.get(cache_key) or memory.load_diagnostic_quiz()
     if not questions:
         logger.info("Generating new diagnostic quiz...")
-        questions = diagnostic_agent.generate_quiz(goal)
+        questions = await get_diagnostic_agent().agenerate_quiz(goal)
         memory.save_diagnostic_quiz(questions)
     else:
-        logger.info("Loaded existing diagnostic quiz from disk.")
-    
-    return [
-        QuestionResponse(
-            id=i,
-            text=q.text,
-            difficulty=q.difficulty,
-            key_concept=q.key_concept
-        )
-        for i, q in enumerate(questions)
-    ]
+        hot_logger.info("Loaded existing diagnostic quiz.")
+    quiz_id = issue_quiz(memory, cache_key, questions)
+    cache_questions(cache_key, questions)
+    
+    return ORJSONResponse(content=question_payload(questions), headers={"X-Quiz-ID": quiz_id})
 
 
-@app.post("/projects/{project_id}/diagnostic", response_model=AssessmentResultResponse)
-async def submit_diagnostic(project_id: str, submission: SubmitAnswersRequest, user_id: str = Depends(get_user_id)):
+@app.post("/projects/{project_id}/diagnostic", response_model=None, responses={200: {"model": AssessmentResultResponse}})
+async def submit_diagnostic(project_id: str, submission: SubmitAnswersRequest, background: BackgroundTasks, user_id: str = Depends(get_user_id), memory: MemoryManager = Depends(get_memory_manager_dep)):
     """Submit diagnostic quiz answers and get results using the SAVED quiz."""
-    logger.info(f"Submitting diagnostic for project {project_id} (user {user_id})")
-    memory = get_memory_manager(project_id, user_id)
+    logger.info("Submitting diagnostic for project %s (user %s)", project_id, user_id)
     goal = memory.load_learning_goal()
     
     if not goal:
-         logger.error(f"Goal not found for project {project_id} (user {user_id})")
+         logger.error("Goal not found for project %s (user %s)", project_id, user_id)
          raise HTTPException(status_code=404, detail=f"Project {project_id} not found")
     
     # LOAD the quiz that was actually given to the user
-    questions = memory.load_diagnostic_quiz()
+    cache_key = (user_id, project_id, "diagnostic")
+    quiz_id = parse_quiz_id(submission.quiz_id)
+    questions = (
+        (quiz_id and memory.load_pending_quiz(quiz_id))
+        or questions_cache.get(cache_key)
+        or memory.load_diagnostic_quiz()
+    )
     if not questions:
-        logger.error(f"No saved quiz found for project {project_id}. Cannot grade.")
+        logger.error("No saved quiz found for project %s. Cannot grade.", project_id)
         # Fallback to generating one (unideal but prevents crash)
-        questions = diagnostic_agent.generate_quiz(goal)
+        questions = await get_diagnostic_agent().agenerate_quiz(goal)
+        memory.save_diagnostic_quiz(questions)
+        cache_questions(cache_key, questions)
     
     # Grade using examiner agent
-    result = examiner_agent.evaluate_submission(questions, submission.answers)
+    result = await asyncio.get_running_loop().run_in_executor(
+        grading_pool, get_examiner_agent().evaluate_submission, questions, submission.answers
+    )
+    
+    if quiz_id:
+        memory.delete_pending_quiz(quiz_id)
+        issued_quiz_ids.pop(cache_key, None)
     
     # Save to profile
-    result.timestamp = datetime.now().isoformat()
+    result.timestamp = _now_iso()
     
+    memory.append_assessment(result)
     profile = memory.load_user_profile()
-    profile.assessment_history.append(result)
-    memory.save_user_profile(profile)
     
-    logger.info(f"Diagnostic graded for {project_id}. Score: {result.score}")
-    
-    return AssessmentResultResponse(
-        score=result.score,
-        correct_concepts=result.correct_concepts,
-        missed_concepts=result.missed_concepts,
-        question_results=[
-            QuestionResultResponse(
-                text=r.text,
-                user_answer=r.user_answer,
-                correct_answer=r.correct_answer,
-                explanation=r.explanation,
-                is_correct=r.is_correct
-            )
-            for r in result.question_results
-        ],
-        feedback=result.feedback,
-        excelled_at=result.excelled_at,
-        improvement_areas=result.improvement_areas,
-        challenges=result.challenges,
-        passed=result.score >= 0.8
-    )
+    logger.info("Diagnostic graded for %s. Score: %s", project_id, result.score)
+    # The learner moves on to the first milestone's flashcards next
+    background.add_task(prefetch_flashcards, user_id, project_id, memory, goal, profile)
+    
+    return ORJSONResponse(content=assessment_payload(result, passed=result.score >= 0.8))
 
 
 # ============== Examiner Endpoints ==============
 
-@app.get("/projects/{project_id}/exam", response_model=List[QuestionResponse])
-async def get_exam(project_id: str, user_id: str = Depends(get_user_id)):
+@app.get("/projects/{project_id}/exam", response_model=None, responses={200: {"model": List[QuestionResponse]}})
+async def get_exam(project_id: str, user_id: str = Depends(get_user_id), memory: MemoryManager = Depends(get_memory_manager_dep)):
     """Generate an exam for the current milestone."""
-    logger.info(f"Generating exam for project {project_id} (user {user_id})")
-    memory = get_memory_manager(project_id, user_id)
+    hot_logger.info("Generating exam for project %s (user %s)", project_id, user_id)
     goal = memory.load_learning_goal()
     profile = memory.load_user_profile()
     
     if not goal:
-        logger.error(f"Goal not found for project {project_id} (user {user_id})")
+        logger.error("Goal not found for project %s (user %s)", project_id, user_id)
         raise HTTPException(status_code=404, detail="No learning goal found")
     
-    current_milestone = goal.milestones[profile.current_milestone_index]
-    logger.info(f"Current milestone: {current_milestone.title}")
+    current_milestone = get_current_milestone(goal, profile)
+    if not current_milestone:
+        raise HTTPException(status_code=409, detail="All milestones completed")
+    hot_logger.info("Current milestone: %s", current_milestone.title)
     
-    # Check if exam already exists
-    questions = memory.load_exam_quiz()
+    # Check if exam already exists (in memory, then on disk)
+    cache_key = (user_id, project_id, current_milestone.title)
+    questions = questions_cache.get(cache_key) or memory.load_exam_quiz()
     if not questions:
         logger.info("Generating new exam questions...")
-        questions = examiner_agent.generate_assessment(goal, profile, current_milestone.title)
+        questions = await get_examiner_agent().agenerate_assessment(goal, profile, current_milestone.title)
         memory.save_exam_quiz(questions)
     else:
-        logger.info("Loaded existing exam questions from disk.")
-    
-    return [
-        QuestionResponse(
-            id=i,
-            text=q.text,
-            difficulty=q.difficulty,
-            key_concept=q.key_concept
-        )
-        for i, q in enumerate(questions)
-    ]
+        hot_logger.info("Loaded existing exam questions.")
+    quiz_id = issue_quiz(memory, cache_key, questions)
+    cache_questions(cache_key, questions)
+    
+    return ORJSONResponse(content=question_payload(questions), headers={"X-Quiz-ID": quiz_id})
 
 
-@app.post("/projects/{project_id}/exam", response_model=AssessmentResultResponse)
-async def submit_exam(project_id: str, submission: SubmitAnswersRequest, user_id: str = Depends(get_user_id)):
+@app.get("/projects/{project_id}/exam/stream")
+async def stream_exam(project_id: str, user_id: str = Depends(get_user_id), memory: MemoryManager = Depends(get_memory_manager_dep)):
+    """
+    Server-sent events variant of get_exam: one `question` event per question as it is
+    generated, then a `done` event carrying the quiz_id to submit against.
+    """
+    logger.info("Streaming exam for project %s (user %s)", project_id, user_id)
+    goal = memory.load_learning_goal()
+    profile = memory.load_user_profile()
+    
+    if not goal:
+        raise HTTPException(status_code=404, detail="No learning goal found")
+    
+    current_milestone = get_current_milestone(goal, profile)
+    if not current_milestone:
+        raise HTTPException(status_code=409, detail="All milestones completed")
+    cache_key = (user_id, project_id, current_milestone.title)
+    
+    async def events():
+        questions = questions_cache.get(cache_key) or memory.load_exam_quiz()
+        if questions:
+            for i, q in enumerate(questions):
+                yield sse_event("question", question_item(i, q))
+        else:
+            questions = []
+            try:
+                async for q in get_examiner_agent().astream_assessment(goal, profile, current_milestone.title):
+                    yield sse_event("question", question_item(len(questions), q))
+                    questions.append(q)
+            except Exception as e:
+                logger.error("Exam stream failed for %s: %s", project_id, e)
+                yield sse_event("error", {"detail": "Exam generation failed"})
+                return
+            await asyncio.to_thread(memory.save_exam_quiz, questions)
+        
+        quiz_id = issue_quiz(memory, cache_key, questions)
+        cache_questions(cache_key, questions)
+        yield sse_event("done", {"count": len(questions), "quiz_id": quiz_id})
+    
+    return sse_response(events())
+
+
+@app.post("/projects/{project_id}/exam", response_model=None, responses={200: {"model": AssessmentResultResponse}})
+async def submit_exam(project_id: str, submission: SubmitAnswersRequest, background: BackgroundTasks, user_id: str = Depends(get_user_id), memory: MemoryManager = Depends(get_memory_manager_dep)):
     """Submit exam answers and get results."""
-    logger.info(f"Submitting exam for project {project_id} (user {user_id})")
-    memory = get_memory_manager(project_id, user_id)
+    logger.info("Submitting exam for project %s (user %s)", project_id, user_id)
     goal = memory.load_learning_goal()
     profile = memory.load_user_profile()
     
     if not goal:
-        logger.error(f"Goal not found for project {project_id} (user {user_id})")
+        logger.error("Goal not found for project %s (user %s)", project_id, user_id)
         raise HTTPException(status_code=404, detail="No learning goal found")
     
-    current_milestone = goal.milestones[profile.current_milestone_index]
+    current_milestone = get_current_milestone(goal, profile)
+    if not current_milestone:
+        raise HTTPException(status_code=409, detail="All milestones completed")
     
     # LOAD the exam questions that were actually given to the user
-    questions = memory.load_exam_quiz()
+    cache_key = (user_id, project_id, current_milestone.title)
+    quiz_id = parse_quiz_id(submission.quiz_id)
+    questions = (
+        (quiz_id and memory.load_pending_quiz(quiz_id))
+        or questions_cache.get(cache_key)
+        or memory.load_exam_quiz()
+    )
     if not questions:
-        logger.error(f"No saved exam found for project {project_id}. Cannot grade.")
+        logger.error("No saved exam found for project %s. Cannot grade.", project_id)
         # Fallback to generating (unideal but prevents crash)
-        questions = examiner_agent.generate_assessment(goal, profile, current_milestone.title)
+        questions = await get_examiner_agent().agenerate_assessment(goal, profile, current_milestone.title)
     
     # Grade
-    result = examiner_agent.evaluate_submission(questions, submission.answers)
-    result.timestamp = datetime.now().isoformat()
+    result = await asyncio.get_running_loop().run_in_executor(
+        grading_pool, get_examiner_agent().evaluate_submission, questions, submission.answers
+    )
+    result.timestamp = _now_iso()
+    if quiz_id:
+        memory.delete_pending_quiz(quiz_id)
+        issued_quiz_ids.pop(cache_key, None)
     
     # Update profile
+    memory.append_assessment(result)
     profile.assessment_history.append(result)
     passed = result.score >= 0.8
     
     if passed:
-        logger.info(f"User passed milestone '{current_milestone.title}' for project {project_id}")
+        logger.info("User passed milestone '%s' for project %s", current_milestone.title, project_id)
         profile.completed_milestones.append(current_milestone.title)
         profile.current_milestone_index += 1
         profile.current_deck_path = None
         profile.milestone_start_date = None
         # Clear the exam file so a new one can be generated for the next milestone
-        memory.save_exam_quiz([]) 
+        memory.save_exam_quiz([])
+        questions_cache.pop(cache_key, None)
+        # Warm the next milestone's deck while the learner reads their results
+        background.add_task(prefetch_flashcards, user_id, project_id, memory, goal, profile)
     else:
-        logger.info(f"User failed milestone '{current_milestone.title}' with score {result.score}")
+        logger.info("User failed milestone '%s' with score %s", current_milestone.title, result.score)
     
     memory.save_user_profile(profile)
     
-    return AssessmentResultResponse(
-        score=result.score,
-        correct_concepts=result.correct_concepts,
-        missed_concepts=result.missed_concepts,
-        question_results=[
-            QuestionResultResponse(
-                text=r.text,
-                user_answer=r.user_answer,
-                correct_answer=r.correct_answer,
-                explanation=r.explanation,
-                is_correct=r.is_correct
-            )
-            for r in result.question_results
-        ],
-        feedback=result.feedback,
-        excelled_at=result.excelled_at,
-        improvement_areas=result.improvement_areas,
-        challenges=result.challenges,
-        passed=passed
-    )
+    return ORJSONResponse(content=assessment_payload(result, passed=passed))
 
 
 if __name__ == "__main__":
+    import importlib.util
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    # Workers require an import string; each one imports this module and builds its own agents
+    uvicorn.run(
+        "backend.main:app",
+        host="0.0.0.0",
+        port=8000,
+        # Half the cores (at least two): LLM-bound requests mostly wait on I/O
+        workers=int(os.getenv("WEB_CONCURRENCY", max(2, (os.cpu_count() or 1) // 2))),
+        # uvloop isn't installed on Windows; "auto" falls back to asyncio / h11
+        loop="uvloop" if importlib.util.find_spec("uvloop") else "auto",
+        http="httptools" if importlib.util.find_spec("httptools") else "auto",
+    )
@@ -1,30 +1,41 @@
 from google import genai
 from google.genai import types
-from google.genai.errors import ClientError
-from dotenv import load_dotenv
 import os
 from typing import List
 from pydantic import BaseModel
-from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
 from ..models import LearningGoal, Question, Quiz
-
-load_dotenv()
+from .genai_client import shared_client
+from .retry_policy import llm_retry
+from .response_cache import generate_cached, agenerate_cached
 
 class DiagnosticAgent:
-    def __init__(self):
-        self.client = genai.Client(api_key=os.getenv("GOOGLE_API_KEY"))
+    def __init__(self, client: genai.Client = None):
+        self.client = client or shared_client()
         self.model_id = 'gemini-2.0-flash-lite'
 
-    @retry(
-        retry=retry_if_exception_type(ClientError),
-        stop=stop_after_attempt(5),
-        wait=wait_exponential(multiplier=2, min=4, max=60)
-    )
+    @llm_retry
     def generate_quiz(self, goal: LearningGoal) -> List[Question]:
         """
         Generates a 10-question diagnostic quiz based on the learning goal.
         """
-        prompt = f"""
+        try:
+            return generate_cached(self.client, self.model_id, self._quiz_prompt(goal), Quiz).questions
+        except Exception as e:
+            print(f"Error generating diagnostic quiz: {e}")
+            raise e
+
+    @llm_retry
+    async def agenerate_quiz(self, goal: LearningGoal) -> List[Question]:
+        """Async variant of generate_quiz using the non-blocking client."""
+        try:
+            quiz = await agenerate_cached(self.client, self.model_id, self._quiz_prompt(goal), Quiz)
+            return quiz.questions
+        except Exception as e:
+            print(f"Error generating diagnostic quiz: {e}")
+            raise e
+
+    def _quiz_prompt(self, goal: LearningGoal) -> str:
+        return f"""
         You are an expert Teacher.
         The user has the following learning goal:
         {goal.smart_goal}
@@ -37,17 +48,3 @@ class DiagnosticAgent:
         
         Output a Quiz object containing 10 Question objects.
         """
-
-        try:
-            response = self.client.models.generate_content(
-                model=self.model_id,
-                contents=prompt,
-                config=types.GenerateContentConfig(
-                    response_mime_type='application/json',
-                    response_schema=Quiz
-                )
-            )
-            return response.parsed.questions
-        except Exception as e:
-            print(f"Error generating diagnostic quiz: {e}")
-            raise e
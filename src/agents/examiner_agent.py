@@ -1,25 +1,20 @@
 from google import genai
 from google.genai import types
-from google.genai.errors import ClientError
-from dotenv import load_dotenv
 import os
 import random
-from typing import List
-from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
+from typing import AsyncIterator, List
 from ..models import LearningGoal, UserProfile, Question, AssessmentResult, Quiz
-
-load_dotenv()
+from .genai_client import shared_client
+from .retry_policy import llm_retry
+from .response_cache import generate_cached, agenerate_cached
+from ..utils import JSONArrayStream
 
 class ExaminerAgent:
-    def __init__(self):
-        self.client = genai.Client(api_key=os.getenv("GOOGLE_API_KEY"))
+    def __init__(self, client: genai.Client = None):
+        self.client = client or shared_client()
         self.model_id = 'gemini-2.0-flash-lite'
 
-    @retry(
-        retry=retry_if_exception_type(ClientError),
-        stop=stop_after_attempt(5),
-        wait=wait_exponential(multiplier=2, min=4, max=60)
-    )
+    @llm_retry
     def generate_assessment(self, goal: LearningGoal, user_profile: UserProfile, current_milestone_title: str) -> List[Question]:
         """
         Generates an assessment:
@@ -27,20 +22,64 @@ class ExaminerAgent:
         - 3 questions from previous milestones (Active Recall), if available.
         """
         
+        prompt = self._assessment_prompt(goal, user_profile, current_milestone_title)
+
+        try:
+            return generate_cached(self.client, self.model_id, prompt, Quiz).questions
+        except Exception as e:
+            print(f"Error generating assessment: {e}")
+            raise e
+
+    @llm_retry
+    async def agenerate_assessment(self, goal: LearningGoal, user_profile: UserProfile, current_milestone_title: str) -> List[Question]:
+        """Async variant of generate_assessment using the non-blocking client."""
+        try:
+            quiz = await agenerate_cached(self.client, self.model_id, self._assessment_prompt(goal, user_profile, current_milestone_title), Quiz)
+            return quiz.questions
+        except Exception as e:
+            print(f"Error generating assessment: {e}")
+            raise e
+
+    async def astream_assessment(self, goal: LearningGoal, user_profile: UserProfile, current_milestone_title: str) -> AsyncIterator[Question]:
+        """
+        Streams the questions of generate_assessment one by one as the model produces them.
+        Not retried: a retry after questions were already yielded would duplicate them.
+        """
+        parser = JSONArrayStream()
+        stream = await self.client.aio.models.generate_content_stream(
+            model=self.model_id,
+            contents=self._assessment_prompt(goal, user_profile, current_milestone_title),
+            config=types.GenerateContentConfig(
+                response_mime_type='application/json',
+                response_schema=Quiz
+            )
+        )
+        async for chunk in stream:
+            for question in parser.feed(chunk.text or ""):
+                yield Question(**question)
+
+    def _assessment_prompt(self, goal: LearningGoal, user_profile: UserProfile, current_milestone_title: str) -> str:
         # 1. Active Recall Selection
         active_recall_context = ""
         previous_concepts = []
         
         # Collect concepts from previously completed milestones or past assessment misses
         if user_profile.assessment_history:
-            # Look at past misses
-            all_missed = []
+            # Pick up to 3 random past misses in one pass (reservoir sampling),
+            # without flattening the whole history into a list
+            recall_targets = []
+            seen = 0
             for result in user_profile.assessment_history:
-                all_missed.extend(result.missed_concepts)
+                for concept in result.missed_concepts:
+                    seen += 1
+                    if len(recall_targets) < 3:
+                        recall_targets.append(concept)
+                    else:
+                        j = random.randrange(seen)
+                        if j < 3:
+                            recall_targets[j] = concept
             
-            if all_missed:
-                # Pick 2-3 random missed concepts
-                recall_targets = random.sample(all_missed, min(len(all_missed), 3))
+            if recall_targets:
                 active_recall_context = f"""
                 IMPORTANT: You must include 3 questions specifically testing these previously missed concepts from the project "{goal.smart_goal}":
                 {', '.join(recall_targets)}
@@ -56,7 +95,7 @@ class ExaminerAgent:
             Key Concepts to Test: {', '.join(milestone_detail.concepts)}
             """
 
-        prompt = f"""
+        return f"""
         You are a strict Examiner for the project: "{goal.smart_goal}".
         The user has just finished studying the milestone: "{current_milestone_title}".
         {milestone_context}
@@ -73,25 +112,7 @@ class ExaminerAgent:
         Output a Quiz object containing exactly 10 Question objects.
         """
 
-        try:
-            response = self.client.models.generate_content(
-                model=self.model_id,
-                contents=prompt,
-                config=types.GenerateContentConfig(
-                    response_mime_type='application/json',
-                    response_schema=Quiz
-                )
-            )
-            return response.parsed.questions
-        except Exception as e:
-            print(f"Error generating assessment: {e}")
-            raise e
-
-    @retry(
-        retry=retry_if_exception_type(ClientError),
-        stop=stop_after_attempt(5),
-        wait=wait_exponential(multiplier=2, min=4, max=60)
-    )
+    @llm_retry
     def evaluate_submission(self, questions: List[Question], user_answers: List[str]) -> AssessmentResult:
         """
         Evaluates the user's answers against the generated questions.
@@ -99,9 +120,10 @@ class ExaminerAgent:
         """
         
         # Construct the grading prompt
-        grading_content = "Please grade the following quiz:\n"
-        for i, (q, ans) in enumerate(zip(questions, user_answers)):
-            grading_content += f"Q{i+1}: {q.text}\nCorrect Answer: {q.correct_answer}\nUser Answer: {ans}\nConcept: {q.key_concept}\n\n"
+        grading_content = "Please grade the following quiz:\n" + "".join(
+            f"Q{i+1}: {q.text}\nCorrect Answer: {q.correct_answer}\nUser Answer: {ans}\nConcept: {q.key_concept}\n\n"
+            for i, (q, ans) in enumerate(zip(questions, user_answers))
+        )
             
         prompt = f"""
         {grading_content}
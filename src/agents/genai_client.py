@@ -0,0 +1,39 @@
+import importlib.util
+import os
+from functools import lru_cache
+
+import httpx
+from google import genai
+from google.genai import types
+
+from .. import config  # noqa: F401  (loads .env before settings are read)
+
+# HTTP/2 needs the optional h2 package; without it the pool still keeps HTTP/1.1 connections alive
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+REQUEST_TIMEOUT_MS = 60_000
+
+
+def create_client(api_key: str = None) -> genai.Client:
+    """
+    Builds a Gemini client with persistent keep-alive connection pools.
+    Share one instance between agents so TLS sessions are reused across calls.
+    """
+    transport_args = {
+        "http2": HTTP2_AVAILABLE,
+        "limits": httpx.Limits(max_keepalive_connections=20, keepalive_expiry=60),
+    }
+    return genai.Client(
+        api_key=api_key or os.getenv("GOOGLE_API_KEY"),
+        http_options=types.HttpOptions(
+            timeout=REQUEST_TIMEOUT_MS,
+            client_args=transport_args,
+            async_client_args=transport_args,
+        ),
+    )
+
+
+@lru_cache(maxsize=None)
+def shared_client() -> genai.Client:
+    """Process-wide client that agents fall back to when they aren't handed one."""
+    return create_client()
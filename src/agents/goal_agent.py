@@ -1,28 +1,52 @@
 from google import genai
 from google.genai import types
-from google.genai.errors import ClientError
-from dotenv import load_dotenv
+import logging
 import os
-from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
-from ..models import LearningGoal
+from ..models import LearningGoal, BootstrapResponse
+from .genai_client import shared_client
+from .retry_policy import llm_retry
+from .response_cache import generate_cached, agenerate_cached
 
-load_dotenv()
+logger = logging.getLogger(__name__)
 
 class GoalAgent:
-    def __init__(self):
-        self.client = genai.Client(api_key=os.getenv("GOOGLE_API_KEY"))
+    def __init__(self, client: genai.Client = None):
+        self.client = client or shared_client()
         self.model_id = 'gemini-2.0-flash-lite'
 
-    @retry(
-        retry=retry_if_exception_type(ClientError),
-        stop=stop_after_attempt(5),
-        wait=wait_exponential(multiplier=2, min=4, max=60)
-    )
+    @llm_retry
     def create_learning_plan(self, user_request: str, existing_plan: str = None) -> LearningGoal:
         print(f"DEBUG: Generating initial plan for '{user_request}'")
-        
+        return self._generate(self._plan_prompt(user_request, existing_plan))
+
+    @llm_retry
+    async def abootstrap_project(self, user_request: str, existing_plan: str = None) -> BootstrapResponse:
+        """
+        Generates the learning plan, first-milestone flashcards and diagnostic quiz in one call.
+        """
+        logger.debug("Bootstrapping project for '%s'", user_request)
+        try:
+            return await agenerate_cached(self.client, self.model_id, self._bootstrap_prompt(user_request, existing_plan), BootstrapResponse)
+        except Exception as e:
+            print(f"Error bootstrapping project: {e}")
+            raise e
+
+    def _bootstrap_prompt(self, user_request: str, existing_plan: str = None) -> str:
+        return self._plan_prompt(user_request, existing_plan) + """
+            In the same response, also produce:
+            - initial_flashcards: 15 high-quality flashcards for the FIRST milestone only.
+              Front: Concept, Question, or Term. Back: Definition, Answer, or Explanation.
+              Tags: 1-2 relevant tags (e.g. the milestone title, 'Basic').
+            - diagnostic_questions: a 10-question diagnostic quiz assessing the user's current
+              knowledge across all milestones, ranging from basic to intermediate difficulty.
+
+            Output must be a valid JSON object matching the BootstrapResponse schema,
+            with the plan under learning_goal.
+            """
+
+    def _plan_prompt(self, user_request: str, existing_plan: str = None) -> str:
         if existing_plan:
-            initial_prompt = f"""
+            return f"""
             You are an expert Learning Coach.
             The user wants to learn: "{user_request}".
             
@@ -38,8 +62,7 @@ class GoalAgent:
 
             Output must be a valid JSON object matching the LearningGoal schema.
             """
-        else:
-            initial_prompt = f"""
+        return f"""
             You are an expert Learning Coach.
             The user wants to learn: "{user_request}".
 
@@ -51,26 +74,11 @@ class GoalAgent:
 
             Output must be a valid JSON object matching the LearningGoal schema.
             """
-        
-        return self._generate(initial_prompt)
-
 
-    @retry(
-        retry=retry_if_exception_type(ClientError),
-        stop=stop_after_attempt(5),
-        wait=wait_exponential(multiplier=2, min=4, max=60)
-    )
+    @llm_retry
     def _generate(self, prompt: str) -> LearningGoal:
         try:
-            response = self.client.models.generate_content(
-                model=self.model_id,
-                contents=prompt,
-                config=types.GenerateContentConfig(
-                    response_mime_type='application/json',
-                    response_schema=LearningGoal
-                )
-            )
-            return response.parsed
+            return generate_cached(self.client, self.model_id, prompt, LearningGoal)
         except Exception as e:
             print(f"Error generating learning plan: {e}")
             raise e
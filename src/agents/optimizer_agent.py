@@ -1,13 +1,14 @@
 from google import genai
 from google.genai import types
-from google.genai.errors import ClientError
-from dotenv import load_dotenv
+import asyncio
 import os
 import sys
 import random
-from typing import List
-from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
+from typing import AsyncIterator, List
 from ..models import LearningGoal, UserProfile, Flashcard, FlashcardDeck, FlashcardList, AssessmentResult
+from .genai_client import shared_client
+from .retry_policy import llm_retry
+from ..utils import JSONArrayStream
 
 # Add the parent directory to sys.path to allow importing from tools
 current_dir = os.path.dirname(os.path.abspath(__file__))
@@ -16,88 +17,151 @@ sys.path.append(parent_dir)
 
 from tools.anki_connection import create_anki_deck
 
-load_dotenv()
-
 class OptimizerAgent:
-    def __init__(self):
-        self.client = genai.Client(api_key=os.getenv("GOOGLE_API_KEY"))
+    def __init__(self, client: genai.Client = None):
+        self.client = client or shared_client()
         self.model_id = 'gemini-2.0-flash-lite'
 
-    @retry(
-        retry=retry_if_exception_type(ClientError),
-        stop=stop_after_attempt(5),
-        wait=wait_exponential(multiplier=2, min=4, max=60)
-    )
+    @llm_retry
     def generate_curriculum_and_cards(self, goal: LearningGoal, user_profile: UserProfile) -> tuple[str, List[Flashcard]]:
         """
         Determines the next phase of study and generates Anki flashcards.
         Returns (path to .apkg file, list of Flashcard objects).
         """
         
-        # 1. Determine what to study next based on uncompleted milestones
-        next_milestone = None
-        for m in goal.milestones:
-            if m.title not in user_profile.completed_milestones:
-                next_milestone = m
-                break
-        
+        # 1. Determine what to study next: the milestone the learner is on
+        next_milestone = self._next_milestone(goal, user_profile)
         if not next_milestone:
             return "All milestones completed!", []
 
-        # 2. Generate Flashcards for this milestone
-        prompt = f"""
-        You are an expert Curriculum Designer.
-        The user is working on the milestone: "{next_milestone.title}".
-        Description: {next_milestone.description}
-        Key Concepts: {', '.join(next_milestone.concepts)}
+        # 2. Generate Flashcards for this milestone and write them as a deck
+        return self._generate_deck(
+            self._curriculum_prompt(next_milestone),
+            f"{goal.smart_goal} - {next_milestone.title}", next_milestone.title,
+            "curriculum/cards"
+        )
 
-        Generate 15 high-quality flashcards for this milestone.
-        - Front: Concept, Question, or Term
-        - Back: Definition, Answer, or Explanation
-        - Tags: Add 1-2 relevant tags (e.g., '{next_milestone.title}', 'Basic')
+    @llm_retry
+    async def agenerate_curriculum_and_cards(self, goal: LearningGoal, user_profile: UserProfile) -> tuple[str, List[Flashcard]]:
+        """Async variant of generate_curriculum_and_cards using the non-blocking client."""
+        next_milestone = self._next_milestone(goal, user_profile)
+        if not next_milestone:
+            return "All milestones completed!", []
 
-        Output a FlashcardList object containing Flashcard objects.
+        return await self._agenerate_deck(
+            self._curriculum_prompt(next_milestone),
+            f"{goal.smart_goal} - {next_milestone.title}", next_milestone.title,
+            "curriculum/cards"
+        )
+
+    @llm_retry
+    def generate_remediation_cards(self, goal: LearningGoal, user_profile: UserProfile, result: AssessmentResult) -> tuple[str, List[Flashcard]]:
         """
+        Generates targeted remediation flashcards based on assessment failures.
+        Returns (path to .apkg file, list of Flashcard objects).
+        """
+        current_milestone = goal.milestones[user_profile.current_milestone_index]
+        return self._generate_deck(
+            self._remediation_prompt(current_milestone, result),
+            f"REMEDIATION: {current_milestone.title}", f"REMEDIATION_{current_milestone.title}",
+            "remediation cards"
+        )
+
+    @llm_retry
+    async def agenerate_remediation_cards(self, goal: LearningGoal, user_profile: UserProfile, result: AssessmentResult) -> tuple[str, List[Flashcard]]:
+        """Async variant of generate_remediation_cards using the non-blocking client."""
+        current_milestone = goal.milestones[user_profile.current_milestone_index]
+        return await self._agenerate_deck(
+            self._remediation_prompt(current_milestone, result),
+            f"REMEDIATION: {current_milestone.title}", f"REMEDIATION_{current_milestone.title}",
+            "remediation cards"
+        )
 
+    def _generate_deck(self, prompt: str, deck_name: str, file_stem: str, kind: str) -> tuple[str, List[Flashcard]]:
         try:
             response = self.client.models.generate_content(
                 model=self.model_id,
                 contents=prompt,
-                config=types.GenerateContentConfig(
-                    response_mime_type='application/json',
-                    response_schema=FlashcardList
-                )
+                config=self._flashcard_config()
             )
             flashcards = response.parsed.flashcards
-            
-            # 3. Convert to Dict format for Anki Tool
-            anki_cards = [{'front': c.front, 'back': c.back} for c in flashcards]
-            
-            # 4. Generate Deck
-            deck_name = f"{goal.smart_goal} - {next_milestone.title}"
-            # Sanitize filename
-            filename = f"deck_{next_milestone.title.replace(' ', '_')}.apkg"
-            
-            result_path = create_anki_deck(deck_name, anki_cards, filename=filename)
-            return result_path, flashcards
+            return self._write_deck(deck_name, file_stem, flashcards), flashcards
+        except Exception as e:
+            print(f"Error generating {kind}: {e}")
+            raise e
 
+    async def _agenerate_deck(self, prompt: str, deck_name: str, file_stem: str, kind: str) -> tuple[str, List[Flashcard]]:
+        try:
+            response = await self.client.aio.models.generate_content(
+                model=self.model_id,
+                contents=prompt,
+                config=self._flashcard_config()
+            )
+            flashcards = response.parsed.flashcards
+            # Writing the .apkg is blocking file I/O
+            return await asyncio.to_thread(self._write_deck, deck_name, file_stem, flashcards), flashcards
         except Exception as e:
-            print(f"Error generating curriculum/cards: {e}")
+            print(f"Error generating {kind}: {e}")
             raise e
 
-    @retry(
-        retry=retry_if_exception_type(ClientError),
-        stop=stop_after_attempt(5),
-        wait=wait_exponential(multiplier=2, min=4, max=60)
-    )
-    def generate_remediation_cards(self, goal: LearningGoal, user_profile: UserProfile, result: AssessmentResult) -> tuple[str, List[Flashcard]]:
+    @staticmethod
+    def _write_deck(deck_name: str, file_stem: str, flashcards: List[Flashcard]) -> str:
+        """Writes the cards as an Anki deck; returns the .apkg path."""
+        # Convert to Dict format for Anki Tool
+        anki_cards = [{'front': c.front, 'back': c.back} for c in flashcards]
+        # Sanitize filename
+        filename = f"deck_{file_stem.replace(' ', '_')}.apkg"
+        return create_anki_deck(deck_name, anki_cards, filename=filename)
+
+    async def astream_curriculum_cards(self, goal: LearningGoal, user_profile: UserProfile) -> AsyncIterator[Flashcard]:
         """
-        Generates targeted remediation flashcards based on assessment failures.
-        Returns (path to .apkg file, list of Flashcard objects).
+        Streams the next milestone's flashcards one by one as the model produces them.
+        No .apkg deck is written; callers persist the collected cards themselves.
+        Not retried: a retry after cards were already yielded would duplicate them.
         """
-        current_milestone = goal.milestones[user_profile.current_milestone_index]
-        
-        prompt = f"""
+        next_milestone = self._next_milestone(goal, user_profile)
+        if not next_milestone:
+            return
+
+        parser = JSONArrayStream()
+        stream = await self.client.aio.models.generate_content_stream(
+            model=self.model_id,
+            contents=self._curriculum_prompt(next_milestone),
+            config=self._flashcard_config()
+        )
+        async for chunk in stream:
+            for card in parser.feed(chunk.text or ""):
+                yield Flashcard(**card)
+
+    def _next_milestone(self, goal: LearningGoal, user_profile: UserProfile):
+        # current_milestone_index is the pointer a passed exam advances; the backend and the
+        # CLI resolve the milestone from it too, so cards are always saved under the right title
+        index = user_profile.current_milestone_index
+        return goal.milestones[index] if index < len(goal.milestones) else None
+
+    def _flashcard_config(self) -> types.GenerateContentConfig:
+        return types.GenerateContentConfig(
+            response_mime_type='application/json',
+            response_schema=FlashcardList
+        )
+
+    def _curriculum_prompt(self, next_milestone) -> str:
+        return f"""
+        You are an expert Curriculum Designer.
+        The user is working on the milestone: "{next_milestone.title}".
+        Description: {next_milestone.description}
+        Key Concepts: {', '.join(next_milestone.concepts)}
+
+        Generate 15 high-quality flashcards for this milestone.
+        - Front: Concept, Question, or Term
+        - Back: Definition, Answer, or Explanation
+        - Tags: Add 1-2 relevant tags (e.g., '{next_milestone.title}', 'Basic')
+
+        Output a FlashcardList object containing Flashcard objects.
+        """
+
+    def _remediation_prompt(self, current_milestone, result: AssessmentResult) -> str:
+        return f"""
         You are a Remediation specialist.
         The user failed their assessment for: "{current_milestone.title}".
         
@@ -114,25 +178,3 @@ class OptimizerAgent:
         
         Output a FlashcardList object containing Flashcard objects.
         """
-
-        try:
-            response = self.client.models.generate_content(
-                model=self.model_id,
-                contents=prompt,
-                config=types.GenerateContentConfig(
-                    response_mime_type='application/json',
-                    response_schema=FlashcardList
-                )
-            )
-            flashcards = response.parsed.flashcards
-            anki_cards = [{'front': c.front, 'back': c.back} for c in flashcards]
-            
-            deck_name = f"REMEDIATION: {current_milestone.title}"
-            filename = f"deck_REMEDIATION_{current_milestone.title.replace(' ', '_')}.apkg"
-            
-            result_path = create_anki_deck(deck_name, anki_cards, filename=filename)
-            return result_path, flashcards
-
-        except Exception as e:
-            print(f"Error generating remediation cards: {e}")
-            raise e
@@ -0,0 +1,101 @@
+import asyncio
+import hashlib
+import os
+import time
+from typing import Optional, Type, TypeVar
+
+from google import genai
+from google.genai import types
+from pydantic import BaseModel
+
+from .. import config  # noqa: F401  (loads .env before settings are read)
+
+# Structured responses are stored one JSON file per (model, schema, prompt) hash.
+# LLM_CACHE=0 disables the cache; entries older than LLM_CACHE_TTL seconds are regenerated.
+CACHE_DIR = os.path.expanduser(os.getenv("LLM_CACHE_DIR", "~/.cache/learning_coach"))
+CACHE_TTL = int(os.getenv("LLM_CACHE_TTL", 7 * 86400))
+CACHE_ENABLED = os.getenv("LLM_CACHE", "1") != "0"
+
+M = TypeVar("M", bound=BaseModel)
+
+
+def cache_key(model_id: str, prompt: str, schema: Type[BaseModel]) -> str:
+    return hashlib.sha256(f"{model_id}\0{schema.__name__}\0{prompt}".encode()).hexdigest()
+
+
+def _cache_path(key: str) -> str:
+    return os.path.join(CACHE_DIR, key[:2], f"{key}.json")
+
+
+def get_cached(key: str, schema: Type[M]) -> Optional[M]:
+    """Returns the stored response for key, or None if missing, expired or unreadable."""
+    if not CACHE_ENABLED:
+        return None
+    path = _cache_path(key)
+    try:
+        if time.time() - os.path.getmtime(path) > CACHE_TTL:
+            return None
+        with open(path, 'rb', buffering=0) as f:
+            return schema.model_validate_json(f.read())
+    except (OSError, ValueError):
+        return None
+
+
+def put_cached(key: str, value: BaseModel):
+    """Stores a response; a failed write only costs a future cache miss."""
+    if not CACHE_ENABLED or not isinstance(value, BaseModel):
+        return
+    path = _cache_path(key)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(tmp_path, 'wb') as f:
+            f.write(value.model_dump_json().encode())
+        os.replace(tmp_path, path)
+    except OSError:
+        pass
+
+
+def _json_config(schema: Type[BaseModel]) -> types.GenerateContentConfig:
+    return types.GenerateContentConfig(
+        response_mime_type='application/json',
+        response_schema=schema
+    )
+
+
+def _parsed(response, schema: Type[M]) -> M:
+    """
+    The SDK already validates the text with schema.model_validate_json (pydantic-core's
+    native parser), but swallows validation errors and leaves parsed as None. Re-validate
+    in that case so the caller gets the ValidationError instead of an AttributeError later.
+    """
+    if response.parsed is not None:
+        return response.parsed
+    return schema.model_validate_json(response.text or "")
+
+
+def generate_cached(client: genai.Client, model_id: str, prompt: str, schema: Type[M], refresh: bool = False) -> M:
+    """
+    generate_content for a JSON schema response, served from the disk cache when possible.
+    refresh=True skips the lookup and overwrites the entry (e.g. to retry a rejected response).
+    """
+    key = cache_key(model_id, prompt, schema)
+    cached = None if refresh else get_cached(key, schema)
+    if cached is not None:
+        return cached
+    response = client.models.generate_content(model=model_id, contents=prompt, config=_json_config(schema))
+    parsed = _parsed(response, schema)
+    put_cached(key, parsed)
+    return parsed
+
+
+async def agenerate_cached(client: genai.Client, model_id: str, prompt: str, schema: Type[M], refresh: bool = False) -> M:
+    """Async variant of generate_cached; cache file I/O runs off the event loop."""
+    key = cache_key(model_id, prompt, schema)
+    cached = None if refresh else await asyncio.to_thread(get_cached, key, schema)
+    if cached is not None:
+        return cached
+    response = await client.aio.models.generate_content(model=model_id, contents=prompt, config=_json_config(schema))
+    parsed = _parsed(response, schema)
+    await asyncio.to_thread(put_cached, key, parsed)
+    return parsed
@@ -0,0 +1,44 @@
+from google.genai.errors import APIError
+from tenacity import retry, retry_if_exception, stop_after_attempt, wait_exponential
+
+# Status codes worth another attempt: timeouts, rate limits and server-side failures.
+# Anything else (bad request, auth, schema errors) fails the same way every time.
+TRANSIENT_STATUS_CODES = frozenset({408, 429, 500, 502, 503, 504})
+MAX_RETRY_DELAY = 60
+
+_backoff = wait_exponential(multiplier=2, min=4, max=MAX_RETRY_DELAY)
+
+
+def _is_transient(e: BaseException) -> bool:
+    return isinstance(e, APIError) and e.code in TRANSIENT_STATUS_CODES
+
+
+def _server_retry_delay(e: BaseException):
+    """The delay the API asked for, from a Retry-After header or a RetryInfo detail; None if absent."""
+    headers = getattr(getattr(e, "response", None), "headers", None)
+    value = headers.get("Retry-After") if headers else None
+    if value is None:
+        # Gemini reports rate-limit delays in the error body, e.g. {"retryDelay": "12s"}
+        error = e.details.get("error", {}) if isinstance(getattr(e, "details", None), dict) else {}
+        for detail in error.get("details") or []:
+            if isinstance(detail, dict) and detail.get("@type", "").endswith("RetryInfo"):
+                value = str(detail.get("retryDelay", "")).rstrip("s")
+                break
+    try:
+        return min(max(float(value), 0.0), MAX_RETRY_DELAY)
+    except (TypeError, ValueError):
+        # Missing, or an HTTP-date Retry-After: fall back to exponential backoff
+        return None
+
+
+def _wait(retry_state) -> float:
+    delay = _server_retry_delay(retry_state.outcome.exception())
+    return delay if delay is not None else _backoff(retry_state)
+
+
+# Shared by every agent call: works on both sync and async methods
+llm_retry = retry(
+    retry=retry_if_exception(_is_transient),
+    stop=stop_after_attempt(5),
+    wait=_wait,
+)
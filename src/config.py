@@ -0,0 +1,4 @@
+"""Loads the project's .env once per process; modules that read settings import this first."""
+from dotenv import load_dotenv
+
+load_dotenv()
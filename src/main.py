@@ -1,40 +1,43 @@
 import sys
 import os
+import asyncio
 import datetime
-import json
+from functools import lru_cache
 # Ensure we can import from src
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from src.memory import MemoryManager
-from src.agents.goal_agent import GoalAgent
-from src.agents.diagnostic_agent import DiagnosticAgent
-from src.agents.optimizer_agent import OptimizerAgent
-from src.agents.examiner_agent import ExaminerAgent
-from src.models import AssessmentResult
-from src.utils import to_snake_case
+from src.utils import to_snake_case, read_smart_goal, truncate_title
 from src.migration import migrate_legacy_data
 
+@lru_cache(maxsize=128)
+def _read_project_title(goal_path: str, mtime_ns: int) -> str:
+    """smart_goal from a learning_goal.json; cached until the file's mtime changes."""
+    return read_smart_goal(goal_path, default=os.path.basename(os.path.dirname(goal_path)))
+
 def list_projects(base_path: str = ".coin_cache") -> list[str]:
     """Lists available project directories in the base cache path."""
-    if not os.path.exists(base_path):
-        return []
-    
     projects = []
-    for item in os.listdir(base_path):
-        item_path = os.path.join(base_path, item)
-        # Check if directory and contains learning_goal.json
-        if os.path.isdir(item_path) and os.path.exists(os.path.join(item_path, "learning_goal.json")):
+    try:
+        entries = os.scandir(base_path)
+    except FileNotFoundError:
+        return projects
+    
+    with entries:
+        for entry in entries:
+            # Directory type comes from the directory listing itself, no extra stat
+            if not entry.is_dir(follow_symlinks=False):
+                continue
+            goal_path = os.path.join(entry.path, "learning_goal.json")
             # Get display title
             try:
-                with open(os.path.join(item_path, "learning_goal.json"), 'r') as f:
-                    data = json.load(f)
-                    title = data.get("smart_goal", item)
-                    # Truncate likely long smart_goal for display
-                    if len(title) > 60:
-                        title = title[:57] + "..."
-                    projects.append((item, title))
+                title = _read_project_title(goal_path, os.stat(goal_path).st_mtime_ns)
+            except FileNotFoundError:
+                # Not a project directory
+                continue
             except Exception:
-                projects.append((item, item))
+                title = entry.name
+            # Truncate likely long smart_goal for display, as the API does
+            projects.append((entry.name, truncate_title(title)))
     return projects
 
 def get_project_choice() -> tuple[str, str]:
@@ -45,10 +48,12 @@ def get_project_choice() -> tuple[str, str]:
     """
     projects = list_projects()
     
-    print("\nSelect an option:")
-    print("  0. Start a new lesson")
-    for i, (dirname, title) in enumerate(projects):
-        print(f"  {i+1}. Continue '{title}'")
+    # One write for the whole menu
+    print("\n".join([
+        "\nSelect an option:",
+        "  0. Start a new lesson",
+        *(f"  {i+1}. Continue '{title}'" for i, (dirname, title) in enumerate(projects)),
+    ]))
     
     while True:
         choice = input("\nEnter your choice (number): ").strip()
@@ -81,6 +86,13 @@ def main():
     print(f"\n📂 Loading project space: {project_dir_name}...")
 
     # 2. Initialize Components
+    # Imported here: the agents pull in the GenAI client, which the project menu doesn't need
+    from src.memory import MemoryManager
+    from src.agents.goal_agent import GoalAgent
+    from src.agents.diagnostic_agent import DiagnosticAgent
+    from src.agents.optimizer_agent import OptimizerAgent
+    from src.agents.examiner_agent import ExaminerAgent
+
     memory = MemoryManager(storage_dir=project_path)
     goal_agent = GoalAgent()
     diagnostic_agent = DiagnosticAgent()
@@ -90,6 +102,8 @@ def main():
     # 3. Check State
     user_profil = memory.load_user_profile()
     learning_goal = memory.load_learning_goal()
+    # First milestone's deck, generated alongside the diagnostic quiz for new projects
+    prefetched_deck_path = None
 
     # --- Phase 1: Initialization ---
     if not learning_goal:
@@ -146,12 +160,13 @@ def main():
         
         # --- Plan Approval Loop (Moved from Agent to CLI) ---
         while True:
-            # Display Plan Summary
-            print(f"\n📋 Proposed Plan: {learning_goal.smart_goal}")
-            print(f"⏱️  Duration: {learning_goal.total_duration_days} days")
-            print("Milestones:")
-            for i, m in enumerate(learning_goal.milestones):
-                print(f"  {i+1}. {m.title} ({m.duration_days} days): {m.description}")
+            # Display Plan Summary (one write instead of one per line)
+            print("\n".join([
+                f"\n📋 Proposed Plan: {learning_goal.smart_goal}",
+                f"⏱️  Duration: {learning_goal.total_duration_days} days",
+                "Milestones:",
+                *(f"  {i+1}. {m.title} ({m.duration_days} days): {m.description}" for i, m in enumerate(learning_goal.milestones)),
+            ]))
             
             # User Feedback
             print("\nDoes this plan look good to you?")
@@ -169,7 +184,13 @@ def main():
         print(f"\n✅ Plan Finalized: {learning_goal.smart_goal}")
 
         print("\n🩺 Let's assess your starting baseline...")
-        questions = diagnostic_agent.generate_quiz(learning_goal)
+        # The quiz and the first deck don't depend on each other: wait for max(t1, t2), not the sum
+        async def prepare_start():
+            return await asyncio.gather(
+                diagnostic_agent.agenerate_quiz(learning_goal),
+                optimizer_agent.agenerate_curriculum_and_cards(learning_goal, user_profil),
+            )
+        questions, (prefetched_deck_path, _) = asyncio.run(prepare_start())
         
         # Administer Quiz
         user_answers = []
@@ -183,6 +204,7 @@ def main():
         result.timestamp = datetime.datetime.now().isoformat()
         
         user_profil.assessment_history.append(result)
+        memory.append_assessment(result)
         memory.save_user_profile(user_profil)
         print(f"\n📊 Baseline Assessment: {result.score * 100:.1f}%")
         print(f"💡 Feedback: {result.feedback}")
@@ -196,19 +218,12 @@ def main():
     # --- Phase 2: Loop ---
     while True:
         # Check completion
-        completed_titles = user_profil.completed_milestones
-        all_milestones = [m.title for m in learning_goal.milestones]
-        
-        if len(completed_titles) == len(all_milestones):
+        if user_profil.current_milestone_index >= len(learning_goal.milestones):
             print("\n🎉 CONGRATULATIONS! You have completed all milestones for this goal!")
             break
 
-        # Identify Current Milestone
-        current_milestone = None
-        for m in learning_goal.milestones:
-            if m.title not in completed_titles:
-                current_milestone = m
-                break
+        # Identify Current Milestone (the index a passed exam advances, as in the backend)
+        current_milestone = learning_goal.milestones[user_profil.current_milestone_index]
         
         print(f"\n🚀 Current Phase: {current_milestone.title}")
         print(f"ℹ️  {current_milestone.description}")
@@ -222,8 +237,11 @@ def main():
             print(f"\n🔄 Resuming study plan (Started: {start_date})...")
             print(f"✅ Anki Deck available at: {deck_path}")
         else:
-            print("\n⚡ Generating Study Materials (Anki Deck)...")
-            deck_path, _ = optimizer_agent.generate_curriculum_and_cards(learning_goal, user_profil)
+            if prefetched_deck_path:
+                deck_path, prefetched_deck_path = prefetched_deck_path, None
+            else:
+                print("\n⚡ Generating Study Materials (Anki Deck)...")
+                deck_path, _ = optimizer_agent.generate_curriculum_and_cards(learning_goal, user_profil)
             
             # Save active state
             user_profil.current_deck_path = deck_path
@@ -255,6 +273,7 @@ def main():
         exam_result.timestamp = datetime.datetime.now().isoformat()
         
         user_profil.assessment_history.append(exam_result)
+        memory.append_assessment(exam_result)
         
         print(f"\n📊 Score: {exam_result.score * 100:.1f}%")
         print(f"💡 Feedback: {exam_result.feedback}")
@@ -1,112 +1,219 @@
-import json
 import os
+import threading
+from collections import OrderedDict
+import orjson
 from typing import List, Optional
-from .models import UserProfile, LearningGoal, Question
+from pydantic import TypeAdapter
+from .models import UserProfile, LearningGoal, Question, Flashcard, AssessmentResult
+
+
+# Parsed files that callers never mutate (quizzes, decks, the assessment history) are
+# memoized per path, stamped with (mtime_ns, size), so repeated reads of an unchanged file
+# skip the I/O and validation entirely. Saves drop the entry explicitly, so a rewrite within
+# the filesystem's mtime granularity is never served stale. The goal and profile are mutated
+# by callers and would need a deep copy per hit, which costs more than re-parsing the file:
+# those are read and validated on every load instead (_load_model).
+# Both parse the bytes straight into models in pydantic-core, with no dict in between.
+PARSED_CACHE_SIZE = 1024
+_parsed_cache: "OrderedDict[str, tuple]" = OrderedDict()
+_parsed_cache_lock = threading.Lock()
+
+# Whole-list validation and serialization in one pydantic-core call each
+_questions_adapter = TypeAdapter(List[Question])
+_flashcards_adapter = TypeAdapter(List[Flashcard])
+
+
+def _read_bytes(path: str) -> bytes:
+    # Unbuffered: FileIO.readall sizes one read from fstat, with no BufferedReader copy
+    with open(path, 'rb', buffering=0) as f:
+        return f.read()
+
+
+def _load_parsed(path: str, parse):
+    """Returns parse(file bytes) for path, from the cache when the file is unchanged; None if missing."""
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    stamp = (st.st_mtime_ns, st.st_size)
+    with _parsed_cache_lock:
+        entry = _parsed_cache.get(path)
+        if entry and entry[0] == stamp:
+            _parsed_cache.move_to_end(path)
+            return entry[1]
+    try:
+        value = parse(_read_bytes(path))
+    except FileNotFoundError:
+        return None
+    with _parsed_cache_lock:
+        _parsed_cache[path] = (stamp, value)
+        if len(_parsed_cache) > PARSED_CACHE_SIZE:
+            _parsed_cache.popitem(last=False)
+    return value
+
+
+def _load_model(path: str, parse):
+    """Returns parse(file bytes) for path, read fresh on every call; None if missing."""
+    try:
+        return parse(_read_bytes(path))
+    except FileNotFoundError:
+        return None
+
+
+def _forget(path: str):
+    with _parsed_cache_lock:
+        _parsed_cache.pop(path, None)
+
+
+def _dump_cards(cards: List) -> bytes:
+    # Decks are homogeneous (Flashcard models from the agents, or plain dicts), so branch once
+    if cards and isinstance(cards[0], Flashcard):
+        return _flashcards_adapter.dump_json(cards, indent=2)
+    return orjson.dumps(cards, option=orjson.OPT_INDENT_2)
+
+
+def _parse_assessments(data: bytes) -> List[AssessmentResult]:
+    return [AssessmentResult.model_validate_json(line) for line in data.splitlines() if line]
+
+
+# Storage directories already created by this process
+_known_dirs: set = set()
+
 
 class MemoryManager:
     def __init__(self, storage_dir=".coin_cache"):
         self.storage_dir = storage_dir
-        os.makedirs(self.storage_dir, exist_ok=True)
+        if storage_dir not in _known_dirs:
+            os.makedirs(self.storage_dir, exist_ok=True)
+            _known_dirs.add(storage_dir)
         self.user_file = f"{self.storage_dir}/user_profile.json"
         self.goal_file = f"{self.storage_dir}/learning_goal.json"
         self.diagnostic_file = f"{self.storage_dir}/diagnostic_quiz.json"
         self.exam_file = f"{self.storage_dir}/exam_quiz.json"
+        self.assessments_file = f"{self.storage_dir}/assessments.jsonl"
+        self.pending_quiz_dir = f"{self.storage_dir}/pending_quizzes"
 
     def get_project_title(self) -> str:
         """Returns the project title from the learning goal if available."""
-        goal = self.load_learning_goal()
+        goal = _load_model(self.goal_file, LearningGoal.model_validate_json)
         return goal.smart_goal if goal else "Unknown Project"
 
     def save_user_profile(self, profile: UserProfile):
-        with open(self.user_file, 'w') as f:
-            f.write(profile.model_dump_json(indent=2))
+        # The assessment history lives in assessments.jsonl, written one result at a
+        # time by append_assessment, so saving the profile never rewrites it
+        data = profile.model_dump(mode='json', exclude={'assessment_history'})
+        with open(self.user_file, 'wb') as f:
+            f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
 
     def load_user_profile(self) -> UserProfile:
-        if not os.path.exists(self.user_file):
-            return UserProfile()
-        with open(self.user_file, 'r') as f:
-            data = json.load(f)
-            return UserProfile(**data)
+        history = _load_parsed(self.assessments_file, _parse_assessments)
+        profile = _load_model(self.user_file, UserProfile.model_validate_json)
+        if profile is None:
+            profile = UserProfile()
+        elif history is None and profile.assessment_history:
+            # Profiles saved before the history moved out still carry it inline:
+            # move it to assessments.jsonl so later saves don't drop it
+            self._write_assessments(profile.assessment_history, 'wb')
+            return profile
+        profile.assessment_history = list(history) if history is not None else []
+        return profile
+
+    def append_assessment(self, result: AssessmentResult):
+        """Records one graded assessment; call it where the result is produced."""
+        self._write_assessments([result], 'ab')
+
+    def _write_assessments(self, results: List[AssessmentResult], mode: str):
+        # One write per call: an O_APPEND write of a few lines isn't interleaved with other appenders
+        with open(self.assessments_file, mode) as f:
+            f.write(b"".join(result.model_dump_json().encode() + b"\n" for result in results))
+        _forget(self.assessments_file)
 
     def save_learning_goal(self, goal: LearningGoal):
-        with open(self.goal_file, 'w') as f:
-            f.write(goal.model_dump_json(indent=2))
+        with open(self.goal_file, 'wb') as f:
+            f.write(orjson.dumps(goal.model_dump(mode='json'), option=orjson.OPT_INDENT_2))
 
     def load_learning_goal(self) -> LearningGoal:
-        if not os.path.exists(self.goal_file):
-            return None
-        with open(self.goal_file, 'r') as f:
-            data = json.load(f)
-            return LearningGoal(**data)
+        return _load_model(self.goal_file, LearningGoal.model_validate_json)
 
     def save_diagnostic_quiz(self, questions: List[Question]):
         """Saves the generated diagnostic quiz for consistency during grading."""
-        with open(self.diagnostic_file, 'w') as f:
-            json.dump([q.model_dump() for q in questions], f, indent=2)
+        with open(self.diagnostic_file, 'wb') as f:
+            f.write(_questions_adapter.dump_json(questions, indent=2))
+        _forget(self.diagnostic_file)
 
     def load_diagnostic_quiz(self) -> Optional[List[Question]]:
         """Loads the saved diagnostic quiz."""
-        if not os.path.exists(self.diagnostic_file):
-            return None
-        with open(self.diagnostic_file, 'r') as f:
-            data = json.load(f)
-            return [Question(**q) for q in data]
+        questions = _load_parsed(self.diagnostic_file, _questions_adapter.validate_json)
+        # New list each call; the (never mutated) questions themselves are shared
+        return list(questions) if questions is not None else None
 
     def clear_memory(self):
-        if os.path.exists(self.user_file):
-            os.remove(self.user_file)
-        if os.path.exists(self.goal_file):
-            os.remove(self.goal_file)
-        if os.path.exists(self.diagnostic_file):
-            os.remove(self.diagnostic_file)
-        if os.path.exists(self.exam_file):
-            os.remove(self.exam_file)
+        for path in (self.user_file, self.assessments_file, self.goal_file, self.diagnostic_file, self.exam_file):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            _forget(path)
 
     def save_exam_quiz(self, questions: List[Question]):
         """Saves the generated exam quiz for consistency during grading."""
-        with open(self.exam_file, 'w') as f:
-            json.dump([q.model_dump() for q in questions], f, indent=2)
+        with open(self.exam_file, 'wb') as f:
+            f.write(_questions_adapter.dump_json(questions, indent=2))
+        _forget(self.exam_file)
 
     def load_exam_quiz(self) -> Optional[List[Question]]:
         """Loads the saved exam quiz."""
-        if not os.path.exists(self.exam_file):
-            return None
-        with open(self.exam_file, 'r') as f:
-            data = json.load(f)
-            return [Question(**q) for q in data]
+        questions = _load_parsed(self.exam_file, _questions_adapter.validate_json)
+        return list(questions) if questions is not None else None
     
+    def save_pending_quiz(self, quiz_id: str, questions: List[Question]):
+        """Persists a quiz handed out to a client so its submission is graded against it."""
+        os.makedirs(self.pending_quiz_dir, exist_ok=True)
+        pending_file = f"{self.pending_quiz_dir}/{quiz_id}.json"
+        # Write then rename so a crash never leaves a half-written quiz behind
+        tmp_file = f"{pending_file}.tmp"
+        with open(tmp_file, 'wb') as f:
+            f.write(_questions_adapter.dump_json(questions))
+        os.replace(tmp_file, pending_file)
+
+    def load_pending_quiz(self, quiz_id: str) -> Optional[List[Question]]:
+        """Loads a previously handed-out quiz, or None if it is unknown."""
+        try:
+            return _questions_adapter.validate_json(_read_bytes(f"{self.pending_quiz_dir}/{quiz_id}.json"))
+        except FileNotFoundError:
+            return None
+
+    def delete_pending_quiz(self, quiz_id: str):
+        """Removes a pending quiz once it has been graded."""
+        try:
+            os.remove(f"{self.pending_quiz_dir}/{quiz_id}.json")
+        except FileNotFoundError:
+            pass
+
     def save_milestone_flashcards(self, milestone_title: str, flashcards: List):
         """Saves generated flashcards for a specific milestone."""
-        from .models import Flashcard
         safe_title = milestone_title.replace(' ', '_').replace('/', '_')
         flashcard_file = f"{self.storage_dir}/flashcards_{safe_title}.json"
-        with open(flashcard_file, 'w') as f:
-            json.dump([card.model_dump() if isinstance(card, Flashcard) else card for card in flashcards], f, indent=2)
+        with open(flashcard_file, 'wb') as f:
+            f.write(_dump_cards(flashcards))
+        _forget(flashcard_file)
     
     def load_milestone_flashcards(self, milestone_title: str) -> Optional[List]:
         """Loads cached flashcards for a specific milestone."""
-        from .models import Flashcard
         safe_title = milestone_title.replace(' ', '_').replace('/', '_')
         flashcard_file = f"{self.storage_dir}/flashcards_{safe_title}.json"
-        if not os.path.exists(flashcard_file):
-            return None
-        with open(flashcard_file, 'r') as f:
-            data = json.load(f)
-            return [Flashcard(**card) for card in data]
+        cards = _load_parsed(flashcard_file, _flashcards_adapter.validate_json)
+        return list(cards) if cards is not None else None
     
     def save_remediation_flashcards(self, flashcards: List):
         """Saves remediation flashcards."""
-        from .models import Flashcard
         remediation_file = f"{self.storage_dir}/flashcards_remediation.json"
-        with open(remediation_file, 'w') as f:
-            json.dump([card.model_dump() if isinstance(card, Flashcard) else card for card in flashcards], f, indent=2)
+        with open(remediation_file, 'wb') as f:
+            f.write(_dump_cards(flashcards))
+        _forget(remediation_file)
     
     def load_remediation_flashcards(self) -> Optional[List]:
         """Loads cached remediation flashcards."""
-        from .models import Flashcard
         remediation_file = f"{self.storage_dir}/flashcards_remediation.json"
-        if not os.path.exists(remediation_file):
-            return None
-        with open(remediation_file, 'r') as f:
-            data = json.load(f)
-            return [Flashcard(**card) for card in data]
+        cards = _load_parsed(remediation_file, _flashcards_adapter.validate_json)
+        return list(cards) if cards is not None else None
@@ -1,7 +1,5 @@
 import os
-import json
-import shutil
-from .utils import to_snake_case
+from .utils import to_snake_case, read_smart_goal
 
 def migrate_legacy_data(base_path: str = ".coin_cache"):
     """
@@ -11,25 +9,12 @@ def migrate_legacy_data(base_path: str = ".coin_cache"):
     legacy_goal_file = os.path.join(base_path, "learning_goal.json")
     legacy_user_file = os.path.join(base_path, "user_profile.json")
 
-    # Check if legacy files exist
-    if not os.path.exists(legacy_goal_file):
-        return
-
     try:
-        # Load the learning goal to determine the project name
-        with open(legacy_goal_file, 'r') as f:
-            data = json.load(f)
-            # Try to get the specific goal or topic. The model has 'smart_goal' often starting with "Master ... in 30 days"
-            # Ideally we want the original user input, but it might not be stored directly as a clean title.
-            # We will use a sanitized version of the smart_goal title or fallback to 'legacy_project'.
-            
-            # Looking at main.py, goal_agent returns a LearningGoal object.
-            # Let's inspect the LearningGoal model in memory.py/models.py if needed, 
-            # but usually it has 'smart_goal' field which is the text.
-            topic = data.get("smart_goal", "Legacy Project")
-            # Truncate if too long (e.g. "Master Quantum Physics in 30 days") -> "master_quantum_physics_in_30_days"
-            # Ideally we'd validte this, but let's just use it.
-            
+        # Only the title is needed to name the project (no legacy goal, nothing to migrate).
+        # Use a sanitized version of the smart_goal, e.g. "Master Quantum Physics in 30 days"
+        # -> "master_quantum_physics_in_30_days", or fall back to 'legacy_project'.
+        topic = read_smart_goal(legacy_goal_file, default="Legacy Project")
+
         project_name = to_snake_case(topic)
         if not project_name:
             project_name = "legacy_project"
@@ -40,14 +25,18 @@ def migrate_legacy_data(base_path: str = ".coin_cache"):
 
         print(f"\n📦 Migrating legacy data to: {new_project_dir}...")
 
-        # Move files
-        shutil.move(legacy_goal_file, os.path.join(new_project_dir, "learning_goal.json"))
+        # Move files (same filesystem: a rename each)
+        os.replace(legacy_goal_file, os.path.join(new_project_dir, "learning_goal.json"))
         
-        if os.path.exists(legacy_user_file):
-            shutil.move(legacy_user_file, os.path.join(new_project_dir, "user_profile.json"))
+        try:
+            os.replace(legacy_user_file, os.path.join(new_project_dir, "user_profile.json"))
+        except FileNotFoundError:
+            pass
 
         print("✅ Migration complete.")
 
+    except FileNotFoundError:
+        return
     except Exception as e:
         print(f"⚠️  Migration failed: {e}")
         # If it fails, we leave it alone to avoid data loss
@@ -1,5 +1,6 @@
 from pydantic import BaseModel, Field
 from typing import List, Dict, Optional
+from .utils import truncate_title
 
 class Flashcard(BaseModel):
     front: str = Field(..., description="Question or Concept")
@@ -54,6 +55,17 @@ class LearningGoal(BaseModel):
     milestones: List[Milestone]
     total_duration_days: int
 
+    @property
+    def display_title(self) -> str:
+        """smart_goal truncated for project lists."""
+        return truncate_title(self.smart_goal)
+
+class BootstrapResponse(BaseModel):
+    """Everything a new project needs up front, generated in a single call."""
+    learning_goal: LearningGoal
+    initial_flashcards: FlashcardList = Field(..., description="Flashcards for the first milestone")
+    diagnostic_questions: Quiz = Field(..., description="Diagnostic quiz across all milestones")
+
 class UserProfile(BaseModel):
     name: str = "Learner"
     topic_mastery: Dict[str, float] = Field(default_factory=dict, description="Map of concept to mastery level (0.0-1.0)")
@@ -1,16 +1,84 @@
 import re
+from functools import lru_cache
+import orjson
 
+# Runs of anything outside [a-z0-9_]; compiled once instead of looked up per call
+_NON_SNAKE_RE = re.compile(r'[^a-z0-9_]+')
+
+# Project names are derived from the same few titles over and over
+@lru_cache(maxsize=256)
 def to_snake_case(text: str) -> str:
     """
     Converts a string to snake case.
     Example: "Learn Discrete Mathematics" -> "learn_discrete_mathematics"
     """
-    # Convert to lowercase
-    text = text.lower()
-    # Replace non-alphanumeric characters (excluding underscores) with spaces
-    text = re.sub(r'[^a-z0-9_]', ' ', text)
-    # Replace whitespace with underscores
-    text = re.sub(r'\s+', '_', text)
-    # Strip leading/trailing underscores
-    text = text.strip('_')
-    return text
+    # Lowercase, collapse each run of non-alphanumeric characters (excluding
+    # underscores) to a single underscore, then strip leading/trailing underscores
+    return _NON_SNAKE_RE.sub('_', text.lower()).strip('_')
+
+
+# The smart_goal string literal; saved goals put it near the top of the file
+_SMART_GOAL_RE = re.compile(rb'"smart_goal"\s*:\s*("(?:[^"\\]|\\.)*")')
+TITLE_PREFIX_BYTES = 4096
+
+def read_smart_goal(goal_path: str, default=None):
+    """
+    Returns the smart_goal of a learning_goal.json without parsing the whole file:
+    only the first few KB are scanned, with a full parse as the fallback.
+    """
+    with open(goal_path, 'rb') as f:
+        head = f.read(TITLE_PREFIX_BYTES)
+        match = _SMART_GOAL_RE.search(head)
+        if match:
+            # Only the title is needed: decode just that string literal
+            return orjson.loads(match.group(1))
+        data = orjson.loads(head + f.read())
+    return data.get("smart_goal", default)
+
+
+def truncate_title(text: str, limit: int = 60) -> str:
+    """Shortens a title for list display, marking the cut with an ellipsis."""
+    return text if len(text) <= limit else text[:limit] + "..."
+
+
+class JSONArrayStream:
+    """
+    Incrementally extracts the items of a streamed JSON document shaped like
+    {"key": [{...}, {...}]}: feed text chunks as they arrive and each call
+    returns the objects completed so far.
+    """
+
+    # Nesting level (objects and arrays) at which list items open
+    ITEM_DEPTH = 2
+
+    def __init__(self):
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._item = None
+
+    def feed(self, chunk: str) -> list:
+        items = []
+        for char in chunk:
+            if self._item is not None:
+                self._item.append(char)
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == '\\':
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+            elif char == '"':
+                self._in_string = True
+            elif char in '{[':
+                if char == '{' and self._depth == self.ITEM_DEPTH:
+                    self._item = [char]
+                self._depth += 1
+            elif char in '}]':
+                self._depth -= 1
+                if self._item is not None and self._depth == self.ITEM_DEPTH:
+                    items.append(orjson.loads("".join(self._item)))
+                    self._item = None
+        return items
@@ -0,0 +1,17 @@
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'tools'))
+
+import generate_diagram
+
+
+class DotSourceTest(unittest.TestCase):
+    def test_shipped_source_matches_builder(self):
+        # DOT_SRC is what gets rendered; --rebuild-source must reproduce it exactly
+        self.assertEqual(generate_diagram._build_dot().source, generate_diagram.DOT_SRC)
+
+
+if __name__ == "__main__":
+    unittest.main()
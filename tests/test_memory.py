@@ -0,0 +1,82 @@
+import os
+import sys
+import tempfile
+import unittest
+
+import orjson
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.memory import MemoryManager
+from src.models import AssessmentResult, UserProfile
+
+
+def result(score, timestamp):
+    return AssessmentResult(score=score, feedback=f"scored {score}", timestamp=timestamp)
+
+
+class AssessmentHistoryTest(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        self.memory = MemoryManager(storage_dir=self._tmp.name)
+
+    def write_legacy_profile(self, history):
+        # Profiles saved before assessments.jsonl existed kept the history inline
+        profile = UserProfile(name="Ada", current_milestone_index=1, assessment_history=history)
+        with open(self.memory.user_file, 'wb') as f:
+            f.write(orjson.dumps(profile.model_dump(mode='json'), option=orjson.OPT_INDENT_2))
+
+    def test_legacy_inline_history_is_moved_to_jsonl(self):
+        history = [result(0.5, "2024-01-01T00:00:00"), result(0.9, "2024-01-02T00:00:00")]
+        self.write_legacy_profile(history)
+
+        profile = self.memory.load_user_profile()
+
+        self.assertEqual(profile.name, "Ada")
+        self.assertEqual(profile.current_milestone_index, 1)
+        self.assertEqual(profile.assessment_history, history)
+        with open(self.memory.assessments_file, 'rb') as f:
+            lines = f.read().splitlines()
+        self.assertEqual([AssessmentResult.model_validate_json(line) for line in lines], history)
+
+    def test_jsonl_wins_over_stale_inline_copy(self):
+        legacy = [result(0.5, "2024-01-01T00:00:00")]
+        self.write_legacy_profile(legacy)
+        self.memory.load_user_profile()
+
+        # The profile file still carries the old inline copy; later results only go to the jsonl
+        newer = result(0.8, "2024-01-03T00:00:00")
+        self.memory.append_assessment(newer)
+
+        profile = self.memory.load_user_profile()
+        self.assertEqual(profile.assessment_history, legacy + [newer])
+        # Loading again must not migrate the inline copy a second time
+        self.assertEqual(self.memory.load_user_profile().assessment_history, legacy + [newer])
+
+    def test_history_survives_profile_save(self):
+        first, second = result(0.4, "2024-01-01T00:00:00"), result(0.7, "2024-01-02T00:00:00")
+        self.memory.append_assessment(first)
+        profile = self.memory.load_user_profile()
+        profile.current_milestone_index = 2
+        self.memory.save_user_profile(profile)
+        self.memory.append_assessment(second)
+        self.memory.save_user_profile(self.memory.load_user_profile())
+
+        profile = self.memory.load_user_profile()
+        self.assertEqual(profile.current_milestone_index, 2)
+        self.assertEqual(profile.assessment_history, [first, second])
+        with open(self.memory.user_file, 'rb') as f:
+            self.assertNotIn("assessment_history", orjson.loads(f.read()))
+
+    def test_missing_profile_loads_defaults_with_history(self):
+        entry = result(1.0, "2024-01-01T00:00:00")
+        self.memory.append_assessment(entry)
+
+        profile = self.memory.load_user_profile()
+        self.assertEqual(profile.name, "Learner")
+        self.assertEqual(profile.assessment_history, [entry])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,90 @@
+import os
+import sys
+import tempfile
+import unittest
+
+import orjson
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.utils import JSONArrayStream, TITLE_PREFIX_BYTES, read_smart_goal
+
+CARDS = [
+    {"front": "What does \"O(1)\" mean?", "back": "Constant time {not \"}\" or \"]\"}", "tags": ["basics"]},
+    {"front": "Escapes", "back": "A trailing backslash \\", "tags": []},
+    {"front": "Nested", "back": "b", "meta": {"source": {"page": 3}, "refs": [[1, 2], {"x": "}"}]}, "tags": ["a", "b"]},
+]
+DOC = orjson.dumps({"flashcards": CARDS}, option=orjson.OPT_INDENT_2).decode()
+
+
+def feed_all(chunks):
+    parser = JSONArrayStream()
+    items = []
+    for chunk in chunks:
+        items.extend(parser.feed(chunk))
+    return items
+
+
+class JSONArrayStreamTest(unittest.TestCase):
+    def test_whole_document(self):
+        self.assertEqual(feed_all([DOC]), CARDS)
+
+    def test_every_two_chunk_split(self):
+        # Covers splits inside strings, right after a backslash and inside nested objects
+        for i in range(len(DOC) + 1):
+            with self.subTest(split=i):
+                self.assertEqual(feed_all([DOC[:i], DOC[i:]]), CARDS)
+
+    def test_one_character_chunks(self):
+        self.assertEqual(feed_all(DOC), CARDS)
+
+    def test_items_returned_as_they_complete(self):
+        parser = JSONArrayStream()
+        # Just past the first item's closing brace
+        end_of_first = DOC.index('}', DOC.index('"basics"')) + 1
+        self.assertEqual(parser.feed(DOC[:end_of_first - 1]), [])
+        self.assertEqual(parser.feed(DOC[end_of_first - 1:end_of_first]), CARDS[:1])
+        self.assertEqual(parser.feed(DOC[end_of_first:]), CARDS[1:])
+
+    def test_compact_document(self):
+        self.assertEqual(feed_all([orjson.dumps({"flashcards": CARDS}).decode()]), CARDS)
+
+    def test_empty_array(self):
+        self.assertEqual(feed_all(['{"flashcards": [', ']}']), [])
+
+
+class ReadSmartGoalTest(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        self.path = os.path.join(self._tmp.name, "learning_goal.json")
+
+    def write_goal(self, goal):
+        with open(self.path, 'wb') as f:
+            f.write(orjson.dumps(goal, option=orjson.OPT_INDENT_2))
+
+    def test_escaped_quotes(self):
+        title = 'Learn "Rust" \\ the \\"hard\\" way'
+        self.write_goal({"original_request": "rust", "smart_goal": title, "milestones": []})
+        self.assertEqual(read_smart_goal(self.path), title)
+
+    def test_value_cut_at_prefix_boundary_falls_back_to_full_parse(self):
+        # The opening quote sits inside the scanned prefix, the closing one past it
+        title = "x" * 100 + " \\\"tail\\\""
+        padding = "p" * (TITLE_PREFIX_BYTES - 100)
+        self.write_goal({"original_request": padding, "smart_goal": title, "milestones": []})
+        with open(self.path, 'rb') as f:
+            data = f.read()
+        start = data.index(b'"smart_goal"')
+        self.assertLess(start, TITLE_PREFIX_BYTES)
+        self.assertGreater(start + len(title), TITLE_PREFIX_BYTES)
+        self.assertEqual(read_smart_goal(self.path), title)
+
+    def test_missing_key_returns_default(self):
+        self.write_goal({"original_request": "rust", "milestones": []})
+        self.assertIsNone(read_smart_goal(self.path))
+        self.assertEqual(read_smart_goal(self.path, "Unknown Project"), "Unknown Project")
+
+
+if __name__ == "__main__":
+    unittest.main()
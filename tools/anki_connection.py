@@ -45,6 +45,8 @@ def create_anki_deck(deck_name, flashcards, filename="study_deck.apkg"):
         my_deck.add_note(note)
 
     # 4. Generate the File
-    genanki.Package(my_deck).write_to_file(filename)
+    # The zip is finalized through one large buffer instead of many small writes
+    with open(filename, 'wb', buffering=1 << 20) as f:
+        genanki.Package(my_deck).write_to_file(f)
     
     return f"Success: Deck saved to {filename}"
\ No newline at end of file
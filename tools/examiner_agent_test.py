@@ -1,12 +1,19 @@
+import asyncio
 import sqlite3
 import datetime
+from functools import lru_cache
 from pydantic import BaseModel
 from google import genai
 from google.genai import types
 from dotenv import load_dotenv
 import os
+import sys
 load_dotenv()
 
+# Run from anywhere: the repo root holds src/
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.agents.response_cache import generate_cached
+
 # --- 1. SETUP & CONFIGURATION ---
 # Initialize the new Google Gen AI Client
 client = genai.Client(api_key=os.getenv("GOOGLE_API_KEY"))
@@ -26,13 +33,8 @@ class Quiz(BaseModel):
 
 
 # --- 2. DATABASE HELPERS ---
-def get_topic_for_review(user_id):
-    """Finds a topic where next_review_due is in the past."""
-    conn = sqlite3.connect('learning_coach.db')
-    cursor = conn.cursor()
-    
-    # Simple logic: Find first topic due for review
-    query = """
+# Simple logic: Find first topic due for review
+REVIEW_QUERY = """
     SELECT t.name, s.mastery_score
     FROM user_topic_state s
     JOIN topics t ON s.topic_id = t.topic_id
@@ -40,18 +42,29 @@ def get_topic_for_review(user_id):
     ORDER BY s.next_review_due ASC
     LIMIT 1
     """
-    cursor.execute(query, (user_id, datetime.datetime.now()))
-    result = cursor.fetchone()
-    conn.close()
+
+@lru_cache(maxsize=None)
+def get_connection():
+    """One connection per process, opened on first use; sqlite3 caches the prepared statements on it."""
+    conn = sqlite3.connect('learning_coach.db', check_same_thread=False)
+    conn.execute('PRAGMA journal_mode=WAL')
+    conn.execute('PRAGMA synchronous=NORMAL')
+    return conn
+
+
+def get_topic_for_review(user_id):
+    """Finds a topic where next_review_due is in the past."""
+    result = get_connection().execute(REVIEW_QUERY, (user_id, datetime.datetime.now())).fetchone()
     if result:
         return result[0] 
     return "Introduction to Linear Programming" 
 
 
 # --- 3. THE EXAMINER AGENT ---
-def generate_quiz(topic_name, difficulty="intermediate"):
+def generate_quiz(topic_name, difficulty="intermediate", bypass_cache=False):
     """
     Uses Gemini to generate a strict JSON quiz based on the topic.
+    Identical requests are answered from the on-disk response cache unless bypass_cache is set.
     """
     prompt = f"""
     Create a {difficulty} level quiz about '{topic_name}'.
@@ -59,18 +72,9 @@ def generate_quiz(topic_name, difficulty="intermediate"):
     Focus on conceptual understanding, not just definitions.
     """
 
-    # CALL GEMINI WITH STRUCTURED OUTPUT
-    response = client.models.generate_content(
-        model='gemini-2.0-flash', # Use Flash for speed
-        contents=prompt,
-        config=types.GenerateContentConfig(
-            response_mime_type='application/json',
-            response_schema=Quiz
-        )
-    )
-    
+    # CALL GEMINI WITH STRUCTURED OUTPUT (Flash for speed)
     # The SDK automatically parses the JSON into our Pydantic object
-    return response.parsed
+    return generate_cached(client, 'gemini-2.0-flash', prompt, Quiz, refresh=bypass_cache)
 
 # --- 4. RUNNING THE AGENT LOOP ---
 def run_learning_session(user_id):
@@ -120,7 +124,7 @@ class ValidationResult(BaseModel):
     reasoning: str
 
 # --- 2. THE VERIFIER AGENT (LLM-as-a-Judge) ---
-def validate_quiz_question(topic, question_data):
+async def validate_quiz_question(topic, question_data):
     """
     Acts as a 'Red Teamer' to try and break the generated question.
     """
@@ -142,7 +146,7 @@ def validate_quiz_question(topic, question_data):
     Output JSON with your verdict.
     """
 
-    response = client.models.generate_content(
+    response = await client.aio.models.generate_content(
         model='gemini-2.0-flash', 
         contents=validation_prompt,
         config=types.GenerateContentConfig(
@@ -153,24 +157,35 @@ def validate_quiz_question(topic, question_data):
     
     return response.parsed
 
+async def validate_quiz(topic, questions):
+    """Judges every question concurrently: one round-trip of latency instead of one per question."""
+    return await asyncio.gather(*(validate_quiz_question(topic, q) for q in questions))
+
 # --- 3. THE SAFE GENERATION LOOP ---
-def generate_validated_quiz(topic_name):
+async def generate_validated_quiz(topic_name):
+    """
+    Runs every attempt on one event loop (the loop client.aio's transport is bound to):
+    call it once from the entry point, e.g. asyncio.run(generate_validated_quiz(topic)).
+    """
     print(f"🕵️ Generating and Validating Quiz for: {topic_name}...")
     
     max_retries = 3
     for attempt in range(max_retries):
         # A. Generate (The Original 'Line Cook' Agent)
-        raw_quiz = generate_quiz(topic_name) # From previous code
+        # Retries must not get the rejected quiz back from the cache
+        raw_quiz = await asyncio.to_thread(generate_quiz, topic_name, bypass_cache=attempt > 0) # From previous code
         
         # B. Validate (The 'Food Critic' Agent)
-        # We validate just the first question for this demo
-        verdict = validate_quiz_question(topic_name, raw_quiz.questions[0])
+        # Every question is checked, all in parallel
+        verdicts = await validate_quiz(topic_name, raw_quiz.questions)
         
-        if verdict.is_valid:
-            print("✅ Verification Passed: Question is solid.")
+        if all(verdict.is_valid for verdict in verdicts):
+            print("✅ Verification Passed: All questions are solid.")
             return raw_quiz
         else:
-            print(f"⚠️ Verification Failed: {verdict.reasoning}")
+            for verdict in verdicts:
+                if not verdict.is_valid:
+                    print(f"⚠️ Verification Failed: {verdict.reasoning}")
             print(f"   Refining attempt {attempt+1}...")
             # Ideally, you pass the 'verdict.flaws_found' back to the generator to fix it
             
@@ -1,7 +1,97 @@
+import hashlib
 import os
+import shutil
+import subprocess
+import sys
+from functools import lru_cache
+
+import graphviz
 from graphviz import Digraph
 
-def create_system_diagram():
+# The architecture graph as plain DOT: a static literal, piped straight to `dot`.
+# After editing _build_dot(), regenerate it with `python tools/generate_diagram.py --rebuild-source`.
+DOT_SRC = r"""// AI Learning Coach System Architecture
+digraph {
+	rankdir=TB size=10
+	node [fontname=Helvetica margin=0.2 shape=box style=filled]
+	User [label="User 👤" fillcolor="#e3f2fd" shape=ellipse]
+	Goal [label="GoalAgent 🎯\n(Planner)" fillcolor="#e8f5e9"]
+	Diagnostic [label="DiagnosticAgent 🩺\n(Assessor)" fillcolor="#e8f5e9"]
+	Optimizer [label="OptimizerAgent ⚡\n(Content Creator)" fillcolor="#e8f5e9"]
+	Examiner [label="ExaminerAgent 📝\n(Teacher)" fillcolor="#e8f5e9"]
+	Memory [label="Memory / State 🧠\n(.coin_cache)" fillcolor="#fff9c4" shape=cylinder]
+	Plan [label="Learning Plan" fillcolor="#f3e5f5" shape=note]
+	Anki [label="Anki Deck\n(.apkg)" fillcolor="#f3e5f5" shape=component]
+	User -> Goal [label="1. \"I want to learn...\""]
+	Goal -> Plan [label=Creates]
+	Plan -> Memory [label="Saves Goal"]
+	Plan -> Diagnostic [label="Basis for Quiz"]
+	Diagnostic -> User [label="2. Quiz Questions"]
+	User -> Diagnostic [label=Answers]
+	Diagnostic -> Memory [label="Updates Profile"]
+	Memory -> Optimizer [label="Current Milestone"]
+	Optimizer -> Anki [label="3. Generates"]
+	Anki -> User [label="Studies (3 days)"]
+	User -> Examiner [label="4. Request Exam"]
+	Memory -> Examiner [label=Context]
+	Examiner -> User [label=Questions]
+	User -> Examiner [label=Answers]
+	Examiner -> Memory [label="5. Grades & Updates"]
+}
+"""
+
+@lru_cache(maxsize=None)
+def _graphviz_version() -> str:
+    # graphviz.version() runs `dot -V`; once per process is enough
+    return ".".join(map(str, graphviz.version()))
+
+def render_cached(source, output_path, fmt='png'):
+    """
+    Renders the DOT source to output_path.<fmt> (without writing the source), reusing a
+    previous render of the same source.
+    Renders are stored under figures/.diagram_cache, keyed by the DOT source and the
+    Graphviz version, so a hit skips the layout entirely. A stamp records which render
+    the target holds, so an up-to-date target isn't even copied again.
+    """
+    version = _graphviz_version()
+    key = hashlib.sha256(source.encode() + version.encode()).hexdigest()
+    cache_dir = os.path.join(os.path.dirname(output_path), '.diagram_cache')
+    cached_png = os.path.join(cache_dir, f"{key}.{fmt}")
+    target_png = f"{output_path}.{fmt}"
+    stamp_path = os.path.join(cache_dir, f"{os.path.basename(target_png)}.stamp")
+
+    def target_stamp():
+        # The target's mtime and size too: a checkout or manual edit of the image invalidates it
+        st = os.stat(target_png)
+        return f"{key} {st.st_mtime_ns} {st.st_size}"
+
+    try:
+        with open(stamp_path) as f:
+            if f.read() == target_stamp():
+                return
+    except FileNotFoundError:
+        pass
+
+    if os.path.exists(cached_png):
+        shutil.copyfile(cached_png, target_png)
+    else:
+        # Source in through stdin, image out through stdout: no intermediate .gv file
+        image = subprocess.run(
+            ['dot', f'-T{fmt}'], input=source.encode(), capture_output=True, check=True
+        ).stdout
+        os.makedirs(cache_dir, exist_ok=True)
+        for path in (target_png, cached_png):
+            with open(path, 'wb') as f:
+                f.write(image)
+
+    with open(stamp_path, 'w') as f:
+        f.write(target_stamp())
+
+def _build_dot():
+    """
+    The same graph through the graphviz wrapper; the maintenance source of DOT_SRC.
+    Line breaks in labels are written as DOT's \\n escape, so the source matches DOT_SRC byte for byte.
+    """
     # initialize Digraph
     dot = Digraph(comment='AI Learning Coach System Architecture', format='png')
     dot.attr(rankdir='TB', size='10')
@@ -17,17 +107,17 @@ def create_system_diagram():
     dot.node('User', 'User 👤', fillcolor=c_user, shape='ellipse')
     
     # Agents
-    dot.node('Goal', 'GoalAgent 🎯\n(Planner)', fillcolor=c_agent)
-    dot.node('Diagnostic', 'DiagnosticAgent 🩺\n(Assessor)', fillcolor=c_agent)
-    dot.node('Optimizer', 'OptimizerAgent ⚡\n(Content Creator)', fillcolor=c_agent)
-    dot.node('Examiner', 'ExaminerAgent 📝\n(Teacher)', fillcolor=c_agent)
+    dot.node('Goal', 'GoalAgent 🎯\\n(Planner)', fillcolor=c_agent)
+    dot.node('Diagnostic', 'DiagnosticAgent 🩺\\n(Assessor)', fillcolor=c_agent)
+    dot.node('Optimizer', 'OptimizerAgent ⚡\\n(Content Creator)', fillcolor=c_agent)
+    dot.node('Examiner', 'ExaminerAgent 📝\\n(Teacher)', fillcolor=c_agent)
     
     # State
-    dot.node('Memory', 'Memory / State 🧠\n(.coin_cache)', fillcolor=c_memory, shape='cylinder')
+    dot.node('Memory', 'Memory / State 🧠\\n(.coin_cache)', fillcolor=c_memory, shape='cylinder')
     
     # Artifacts
     dot.node('Plan', 'Learning Plan', fillcolor=c_artifact, shape='note')
-    dot.node('Anki', 'Anki Deck\n(.apkg)', fillcolor=c_artifact, shape='component')
+    dot.node('Anki', 'Anki Deck\\n(.apkg)', fillcolor=c_artifact, shape='component')
     
     # Edges
     # Phase 1
@@ -51,18 +141,23 @@ def create_system_diagram():
     dot.edge('Examiner', 'User', label='Questions')
     dot.edge('User', 'Examiner', label='Answers')
     dot.edge('Examiner', 'Memory', label='5. Grades & Updates')
+    return dot
 
+def create_system_diagram():
     # Output
     output_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'figures', 'architecture_diagram')
     # Ensure dir exists
     os.makedirs(os.path.dirname(output_path), exist_ok=True)
     
     try:
-        dot.render(output_path, view=False)
+        render_cached(DOT_SRC, output_path)
         print(f"Diagram generated successfully at: {output_path}.png")
     except Exception as e:
         print(f"Error generating diagram: {e}")
         print("Note: Graphviz system binaries must be installed on your machine (e.g., 'brew install graphviz').")
 
 if __name__ == "__main__":
-    create_system_diagram()
+    if "--rebuild-source" in sys.argv:
+        sys.stdout.write(_build_dot().source)
+    else:
+        create_system_diagram()
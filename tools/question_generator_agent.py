@@ -2,6 +2,7 @@ from pydantic import BaseModel
 from google import genai
 from google.genai import types
 from dotenv import load_dotenv
+from concurrent.futures import ThreadPoolExecutor
 import os
 
 load_dotenv()
@@ -65,6 +66,17 @@ def generate_study_questions(topic: str, audience_level: str = "intermediate", c
         else:
             raise e
 
+def generate_many(topics: list[str], audience_level: str = "intermediate", count: int = 5, max_workers: int = 8) -> list[QuestionBank]:
+    """
+    Generates a question bank per topic concurrently. Each call spends its time waiting
+    on the API, so threads overlap the round-trips; results come back in topic order.
+    Every call keeps its own retry policy.
+    """
+    if not topics:
+        return []
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(topics))) as executor:
+        return list(executor.map(lambda topic: generate_study_questions(topic, audience_level, count), topics))
+
 # --- DEMONSTRATION ---
 if __name__ == "__main__":
     test_topic = "Neural Networks"
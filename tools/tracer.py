@@ -1,18 +1,224 @@
+import atexit
 import logging
-import json
 import datetime
-# Configure structured logging (The 'Diary' Pillar)
-logging.basicConfig(level=logging.INFO, format='%(message)s')
+import os
+import queue
+import reprlib
+import struct
+import threading
+from logging.handlers import QueueHandler, QueueListener
+import orjson
 
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
 
-def log_agent_trace(step_name, inputs, outputs, error=None):
-    trace_entry = {
-        "timestamp": datetime.datetime.now().isoformat(),
+# Configure structured logging (The 'Diary' Pillar). The trace logger has its own
+# handler chain (below) and leaves the root logger's configuration to the application.
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+_now = datetime.datetime.now
+_TRACE_OPTIONS = orjson.OPT_NON_STR_KEYS
+
+# Inputs and outputs are recorded as bounded reprs, so a huge prompt or history costs
+# O(limit) to trace. TRACE_FULL=1 keeps them whole, encoded as JSON values (whatever
+# orjson can't encode natively falls back to str()).
+TRACE_FULL = os.getenv("TRACE_FULL") == "1"
+_repr = reprlib.Repr()
+_repr.maxstring = 2048
+_repr.maxother = 2048
+_repr.maxlist = _repr.maxtuple = _repr.maxset = 32
+_repr.maxdict = 32
+
+
+def _bounded(value):
+    if TRACE_FULL:
+        return value
+    # Plain strings stay unquoted, as str() would print them
+    if isinstance(value, str):
+        return value if len(value) <= _repr.maxstring else value[:_repr.maxstring] + "..."
+    return _repr.repr(value)
+
+
+class TraceFormatter(logging.Formatter):
+    """Encodes the trace entries attached to a record, one JSON line each; runs on the listener thread."""
+
+    def format(self, record):
+        return "\n".join(
+            orjson.dumps(entry, default=str, option=_TRACE_OPTIONS).decode() for entry in record.traces
+        )
+
+
+class MsgpackTraceFormatter(logging.Formatter):
+    """
+    Encodes each trace entry as a MessagePack frame (4-byte little-endian length, then the body):
+    smaller than JSON text and faster to load back for archived traces.
+    """
+
+    def format(self, record):
+        frames = []
+        for entry in record.traces:
+            body = msgpack.packb(dict(entry, timestamp=entry["timestamp"].isoformat()), default=str, use_bin_type=True)
+            frames.append(struct.pack('<I', len(body)) + body)
+        return b"".join(frames)
+
+
+def _write_all(fd, chunks):
+    """Writes the chunks with one gathered write where the platform has writev."""
+    if hasattr(os, "writev"):
+        written = os.writev(fd, chunks)
+        total = sum(map(len, chunks))
+        data = b"".join(chunks)[written:] if written < total else b""
+    else:
+        data = b"".join(chunks)
+    while data:
+        data = data[os.write(fd, data):]
+
+
+class BatchedFileHandler(logging.Handler):
+    """
+    Appends records to a file in batches: one writev per batch_size records instead of a
+    write per record. A timer thread writes out whatever is pending every flush_interval
+    seconds, so a record waits at most that long after a burst; the rest go out on flush/close.
+    With durable=True each batch is on stable storage before the write returns (O_DSYNC, or
+    an fsync per batch where the platform lacks it), so the sync cost is also paid once per
+    batch. A logged record is therefore durable within flush_interval; until its batch is
+    written it is only in memory.
+    """
+
+    def __init__(self, filename, batch_size=64, flush_interval=1.0, durable=False):
+        super().__init__()
+        flags = os.O_WRONLY | os.O_CREAT | os.O_APPEND
+        # Without O_DSYNC (e.g. Windows) durability comes from an explicit fsync per batch
+        self._fsync = durable and not hasattr(os, "O_DSYNC")
+        if durable and not self._fsync:
+            flags |= os.O_DSYNC
+        self.fd = os.open(filename, flags, 0o644)
+        self.batch_size = batch_size  # keep well under IOV_MAX (1024)
+        self.flush_interval = flush_interval
+        self._pending = []
+        self._closed = threading.Event()
+        self._timer = threading.Thread(target=self._flush_periodically, name="trace-flush", daemon=True)
+        self._timer.start()
+
+    def _flush_periodically(self):
+        while not self._closed.wait(self.flush_interval):
+            self.flush()
+
+    def emit(self, record):
+        try:
+            data = self.format(record)
+            # Binary formats frame themselves; text records are newline-delimited
+            self._pending.append(data if isinstance(data, bytes) else data.encode() + b"\n")
+        except Exception:
+            self.handleError(record)
+            return
+        if len(self._pending) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        self.acquire()
+        try:
+            if self._pending and self.fd is not None:
+                _write_all(self.fd, self._pending)
+                if self._fsync:
+                    os.fsync(self.fd)
+                self._pending = []
+        finally:
+            self.release()
+
+    def close(self):
+        self._closed.set()
+        self._timer.join()
+        self.acquire()
+        try:
+            if self.fd is not None:
+                self.flush()
+                os.close(self.fd)
+                self.fd = None
+        finally:
+            self.release()
+        super().close()
+
+
+# Agent steps only enqueue their traces; a listener thread encodes and writes them,
+# so a step never blocks on the sink. Traces don't also go through the root handlers.
+_queue = queue.SimpleQueue()
+# TRACE_FILE=path persists traces (one JSON object per line) instead of printing them;
+# with TRACE_FORMAT=msgpack the file holds length-prefixed MessagePack frames instead.
+# TRACE_DSYNC=1 makes every batch durable when written.
+_trace_file = os.getenv("TRACE_FILE")
+if _trace_file:
+    _sink = BatchedFileHandler(_trace_file, durable=os.getenv("TRACE_DSYNC") == "1")
+else:
+    _sink = logging.StreamHandler()
+_formatter = TraceFormatter()
+if _trace_file and os.getenv("TRACE_FORMAT") == "msgpack":
+    if msgpack is not None:
+        _formatter = MsgpackTraceFormatter()
+    else:
+        # Logged before the trace handler is attached: this goes to the application's
+        # handlers (or logging.lastResort), never through a trace formatter
+        logger.warning("TRACE_FORMAT=msgpack needs the msgpack package; writing JSON traces")
+_sink.setFormatter(_formatter)
+_listener = QueueListener(_queue, _sink, respect_handler_level=True)
+_listener.start()
+atexit.register(_listener.stop)  # drains whatever is still queued
+logger.addHandler(QueueHandler(_queue))
+logger.propagate = False
+
+
+def _trace_entry(step_name, inputs, outputs, error):
+    """Returns (level, entry) for a trace, or None when the logger filters that level out."""
+    # Failed steps are logged at ERROR, so they survive a level that mutes routine traces;
+    # a filtered-out trace returns before any encoding work
+    level = logging.ERROR if error else logging.INFO
+    if not logger.isEnabledFor(level):
+        return None
+    return level, {
+        "timestamp": _now(),  # orjson writes it in ISO 8601, same as isoformat()
         "span_name": step_name, # e.g., "QuizGeneration", "CriticReview"
-        "inputs": str(inputs),
-        "outputs": str(outputs),
+        # With TRACE_FULL these are encoded later on the listener thread: don't mutate them after logging
+        "inputs": _bounded(inputs),
+        "outputs": _bounded(outputs),
         "status": "ERROR" if error else "SUCCESS",
         "error_details": str(error) if error else None
     }
+
+
+def log_agent_trace(step_name, inputs, outputs, error=None):
+    traced = _trace_entry(step_name, inputs, outputs, error)
+    if traced is None:
+        return
+    level, trace_entry = traced
     # This creates the "Trace" the whitepaper demands for debugging
-    logging.info(json.dumps(trace_entry))
\ No newline at end of file
+    logger.log(level, step_name, extra={"traces": [trace_entry]})
+
+
+class TraceBatch:
+    """
+    Collects the sub-span traces of one composite step and hands them to the sink as a
+    single record on exit (one enqueue, one encode pass, one write):
+
+        with TraceBatch() as batch:
+            batch.add("QuizGeneration", inputs, quiz)
+            batch.add("CriticReview", quiz, verdict)
+    """
+
+    def __enter__(self):
+        self.level = logging.NOTSET
+        self.entries = []
+        return self
+
+    def add(self, step_name, inputs, outputs, error=None):
+        traced = _trace_entry(step_name, inputs, outputs, error)
+        if traced is not None:
+            self.level = max(self.level, traced[0])
+            self.entries.append(traced[1])
+
+    def __exit__(self, exc_type, exc, tb):
+        if self.entries:
+            logger.log(self.level, "batch", extra={"traces": self.entries})
+        return False